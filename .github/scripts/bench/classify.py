@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for commit classification.
+
+Classifies a synthetic corpus of commit subjects (100k by default) with the
+compiled rules engine and with the original linear scan it replaced, checks
+both agree, and reports subjects per second. --extra-rules adds generated
+skip phrases to see how classification scales as the rules file grows.
+It also finds the issue number of a long PR body (a pasted log with a bare
+#NNN every ~100 characters and the closing reference at the end), which
+must stay linear in the body's length.
+
+    python3 .github/scripts/bench/classify.py [--subjects N] [--extra-rules N] [--max-us US]
+                                              [--body-kb KB] [--max-body-ms MS]
+
+With --max-us the run fails if the engine needs more than US microseconds
+per subject on average, and it fails if the long body takes more than
+--max-body-ms (default 250) milliseconds.
+"""
+
+import os, re, sys, json, time, random, argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from devstatus import rules as rules_mod
+
+WORDS = ('add', 'pawn', 'colony', 'raid', 'settings', 'chat', 'provider', 'prompt', 'tool', 'mood',
+         'version', 'using', 'merge', 'branch', 'workshop', 'translation', 'docs', 'ui', 'cache', 'event')
+TYPES = ('feat', 'fix', 'chore', 'docs', 'refactor', 'ci', 'Feat', 'FIX', 'test', '')
+
+def corpus(n, skip, seed=1):
+    rnd = random.Random(seed)
+    subjects = []
+    for _ in range(n):
+        words = [rnd.choice(WORDS) for _ in range(rnd.randint(2, 9))]
+        if rnd.random() < 0.1:
+            words.insert(rnd.randrange(len(words) + 1), rnd.choice(skip))
+        if rnd.random() < 0.15:
+            words.append(rnd.choice(('#12', 'closes #34', 'Fixes #7', '(#101)', '(#5) (#6)')))
+        kind = rnd.choice(TYPES)
+        scope = rnd.choice(('', '(ui)', '(chat)'))
+        subjects.append((f'{kind}{scope}: ' if kind else '') + ' '.join(words))
+    return subjects
+
+def linear_classifier(config):
+    """The pre-engine classification: one substring test per skip phrase, separate regexes after."""
+    skip = [p.lower() for p in config['skip']]
+    feature = re.compile(r'^(%s)(?:\([^)]+\))?:' % '|'.join(config['feature_types']), re.IGNORECASE)
+    strip = re.compile(r'^(%s)(?:\([^)]+\))?:\s*' % '|'.join(config['strip_types']), re.IGNORECASE)
+    keywords = '|'.join(sorted(config['issue_keywords'], key=len, reverse=True))
+    def classify(subject):
+        s = subject.lower()
+        noise = any(p in s for p in skip) or (not feature.match(subject) and not re.search(r'#\d+', subject))
+        title = re.sub(r'(\s*\(#\d+\))+\s*$', '', strip.sub('', subject)).strip()
+        m = re.search(r'(?:%s)\s+#(\d+)' % keywords, subject, re.IGNORECASE) or re.search(r'#(\d+)', subject)
+        return rules_mod.Classification(noise, title, m.group(1) if m else None)
+    return classify
+
+def long_body(kb):
+    line = 'ERROR [Verse] job failed for pawn #1234, retrying with default settings\n'
+    return line * (kb * 1024 // len(line)) + 'Closes #42\n'
+
+def timed(fn, subjects):
+    start = time.perf_counter()
+    results = [fn(s) for s in subjects]
+    return results, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--subjects', type=int, default=100_000)
+    parser.add_argument('--extra-rules', type=int, default=0, help='generated skip phrases to add')
+    parser.add_argument('--max-us', type=float, help='fail above this many microseconds per subject')
+    parser.add_argument('--body-kb', type=int, default=1024, help='size of the long PR body')
+    parser.add_argument('--max-body-ms', type=float, default=250, help='fail above this for the long body')
+    args = parser.parse_args()
+
+    with open(rules_mod.RULES_PATH, encoding='utf-8') as f:
+        config = json.load(f)
+    rnd = random.Random(2)
+    config['skip'] += [' '.join(rnd.sample(WORDS, 3)) + f' {i}' for i in range(args.extra_rules)]
+    subjects = corpus(args.subjects, config['skip'])
+
+    engine = rules_mod.Rules(config)
+    new, new_time = timed(engine.classify, subjects)
+    old, old_time = timed(linear_classifier(config), subjects)
+    mismatches = [s for s, a, b in zip(subjects, new, old) if a != b]
+    body = long_body(args.body_kb)
+    start = time.perf_counter()
+    body_issue = engine.issue_number(body)
+    body_ms = (time.perf_counter() - start) * 1e3
+
+    per_us = new_time / len(subjects) * 1e6
+    print(f"{len(subjects)} subjects, {len(config['skip'])} skip phrases, "
+          f"{sum(c.noise for c in new)} noise")
+    print(f"  compiled engine: {new_time:.3f}s ({per_us:.2f} µs/subject)")
+    print(f"  linear scan:     {old_time:.3f}s ({old_time / len(subjects) * 1e6:.2f} µs/subject)")
+    print(f"  {args.body_kb} KB PR body: {body_ms:.1f}ms, issue #{body_issue}")
+    if mismatches:
+        print(f"  {len(mismatches)} subjects classified differently, e.g. {mismatches[0]!r}")
+        return 1
+    if body_issue != '42':
+        print(f"  long body: expected the closing reference #42, got #{body_issue}")
+        return 1
+    if body_ms > args.max_body_ms:
+        print(f"  long body over budget: {body_ms:.1f}ms > {args.max_body_ms}ms")
+        return 1
+    if args.max_us is not None and per_us > args.max_us:
+        print(f"  over budget: {per_us:.2f} µs > {args.max_us} µs")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
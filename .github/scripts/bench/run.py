@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Offline end-to-end benchmark of the dev status script.
+
+For every combination of repo size, GraphQL/REST backend and git/compare
+commit source, runs .github/scripts/dev-status.py against a synthetic repo
+(see synth.py) and local API stand-ins (see stubs.py): once cold (empty
+response cache, no message posted yet) and once warm (the cache, message IDs
+and hash variables left by the cold run). Each run reports wall-clock, the
+script's own per-phase timings, API calls / payload bytes / 304s / rate-limit
+rejections per API and per endpoint, and peak RSS (of the script and the git
+processes it ran), all as one JSON report.
+
+    python3 .github/scripts/bench/run.py [--sizes 10,1000,50000] [--latency 0.05]
+        [--rate-limit 60 --window 2] [--out report.json] [--baseline old.json] [--no-stall-check]
+
+With --baseline, runs whose wall-clock or API call count grew by more than
+--tolerance over the matching run in the old report are listed and the
+benchmark exits non-zero.
+
+The stall check posts a status once, then runs again while every compare
+page after the first stalls past DEV_STATUS_DEADLINE. The second run loses
+part of its commit list, so it must not post or store anything; if it does,
+the benchmark exits non-zero.
+"""
+
+import os, sys, json, time, shutil, argparse, platform, itertools, subprocess
+from datetime import datetime, timezone
+
+import synth, stubs
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCRIPT = os.path.join(os.path.dirname(HERE), 'dev-status.py')
+
+# Environment the script must not inherit from the machine running the benchmark
+FOREIGN_ENV = ('GITHUB_', 'GH_', 'TELEGRAM_', 'DISCORD_', 'DEV_STATUS_')
+
+def run_script(repo, env):
+    """Run the script once; returns (exit code, wall seconds, peak RSS in KiB, output)."""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, SCRIPT], cwd=repo, env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    output = proc.stdout.read()
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    proc.stdout.close()
+    return proc.returncode, time.perf_counter() - start, usage.ru_maxrss, output.decode('utf-8', 'replace')
+
+def run_scenario(args, size, backend, source):
+    repo = os.path.join(args.work_dir, f'repo-{size}')
+    manifest = synth.ensure_repo(repo, size)
+    run_dir = os.path.join(args.work_dir, f'run-{size}-{backend}-{source}')
+    shutil.rmtree(run_dir, ignore_errors=True)
+    os.makedirs(run_dir)
+
+    stub = stubs.StubAPIs(repo, manifest, latency=args.latency, rate_limit=args.rate_limit, window=args.window)
+    urls = stub.start()
+    base_env = {k: v for k, v in os.environ.items() if not k.startswith(FOREIGN_ENV)}
+    base_env.update(urls,
+                    GH_TOKEN='bench', TELEGRAM_BOT_TOKEN='bench', TELEGRAM_DEV_THREAD_ID='1',
+                    DISCORD_BOT_TOKEN='bench', DISCORD_STATUS_CHANNEL_ID='1',
+                    DEV_STATUS_BACKEND=backend, DEV_STATUS_COMMIT_SOURCE=source,
+                    DEV_STATUS_SKIP_UNCHANGED=args.skip_unchanged,
+                    DEV_STATUS_CACHE_DIR=os.path.join(run_dir, 'cache'))
+    results = []
+    try:
+        for run in ('cold', 'warm'):
+            stub.stats.reset()
+            metrics_path = os.path.join(run_dir, f'{run}-metrics.json')
+            env = dict(base_env, DEV_STATUS_METRICS=metrics_path, **stub.variables)
+            code, wall, rss, output = run_script(repo, env)
+            with open(os.path.join(run_dir, f'{run}.log'), 'w') as f:
+                f.write(output)
+            try:
+                with open(metrics_path) as f:
+                    phases = json.load(f).get('phases_s', {})
+            except (OSError, ValueError):
+                phases = {}
+            traffic = stub.stats.snapshot()
+            results.append({
+                'commits': size, 'backend': backend, 'source': source, 'run': run,
+                'exit_code': code, 'wall_s': round(wall, 4), 'phases_s': phases,
+                'api_calls': sum(a['calls'] for a in traffic['apis'].values()),
+                'apis': traffic['apis'], 'endpoints': traffic['endpoints'],
+                'peak_rss_kib': rss,
+            })
+    finally:
+        stub.stop()
+    return results
+
+STALL_SIZE     = 1000            # enough commits for several compare pages
+STALL_DEADLINE = 3
+STALL          = (r'compare/.*&page=(?!1$)\d+$', 15)    # every page but the first, past the deadline
+
+def stall_check(args):
+    """(results, problem) of the stall check; problem is None if the stalled run posted nothing."""
+    repo = os.path.join(args.work_dir, f'repo-{STALL_SIZE}')
+    manifest = synth.ensure_repo(repo, STALL_SIZE)
+    run_dir = os.path.join(args.work_dir, 'run-stall')
+    shutil.rmtree(run_dir, ignore_errors=True)
+    os.makedirs(run_dir)
+
+    stub = stubs.StubAPIs(repo, manifest, latency=args.latency)
+    env = {k: v for k, v in os.environ.items() if not k.startswith(FOREIGN_ENV)}
+    env.update(stub.start(),
+               GH_TOKEN='bench', TELEGRAM_BOT_TOKEN='bench', TELEGRAM_DEV_THREAD_ID='1',
+               DISCORD_BOT_TOKEN='bench', DISCORD_STATUS_CHANNEL_ID='1',
+               DEV_STATUS_BACKEND='graphql', DEV_STATUS_COMMIT_SOURCE='compare',
+               DEV_STATUS_SKIP_UNCHANGED='content', DEV_STATUS_DEADLINE=str(STALL_DEADLINE),
+               DEV_STATUS_CACHE_DIR=os.path.join(run_dir, 'cache'))
+    results, problem = [], None
+    try:
+        for run in ('cold', 'stalled'):
+            stub.stats.reset()
+            stub.stall = STALL if run == 'stalled' else None
+            before = dict(stub.variables)
+            code, wall, rss, output = run_script(repo, dict(env, **stub.variables))
+            with open(os.path.join(run_dir, f'{run}.log'), 'w') as f:
+                f.write(output)
+            traffic = stub.stats.snapshot()
+            results.append({'commits': STALL_SIZE, 'backend': 'graphql', 'source': 'compare', 'run': run,
+                            'exit_code': code, 'wall_s': round(wall, 4), 'phases_s': {},
+                            'api_calls': sum(a['calls'] for a in traffic['apis'].values()),
+                            'apis': traffic['apis'], 'endpoints': traffic['endpoints'], 'peak_rss_kib': rss})
+            posted = {api for api in ('telegram', 'discord') if api in traffic['apis']}
+            if run == 'stalled' and (posted or stub.variables != before):
+                problem = f"stalled run posted to {sorted(posted) or 'no sink'} and wrote " \
+                          f"{sorted(k for k in stub.variables if stub.variables[k] != before.get(k))}"
+    finally:
+        stub.stop()
+    return results, problem
+
+def key_of(result):
+    return (result['commits'], result['backend'], result['source'], result['run'])
+
+def regressions(results, baseline, tolerance):
+    old = {key_of(r): r for r in baseline.get('results', [])}
+    found = []
+    for r in results:
+        b = old.get(key_of(r))
+        if not b:
+            continue
+        for metric in ('wall_s', 'api_calls'):
+            if r[metric] > b[metric] * (1 + tolerance) and r[metric] - b[metric] > 0.05:
+                found.append(f"{'/'.join(map(str, key_of(r)))}: {metric} {b[metric]} → {r[metric]}")
+    return found
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='10,1000,50000', help='commits ahead of main, comma-separated')
+    parser.add_argument('--backends', default='graphql,rest')
+    parser.add_argument('--sources', default='git,compare')
+    parser.add_argument('--latency', type=float, default=0.02, help='seconds added to every API response')
+    parser.add_argument('--rate-limit', type=int, help='requests per window per API bucket')
+    parser.add_argument('--window', type=float, default=60.0, help='rate-limit window in seconds')
+    parser.add_argument('--skip-unchanged', default='content', choices=('off', 'content', 'inputs'))
+    parser.add_argument('--work-dir', default=os.path.join(os.environ.get('TMPDIR', '/tmp'), 'dev-status-bench'))
+    parser.add_argument('--out', help='write the JSON report here (default: stdout)')
+    parser.add_argument('--baseline', help='earlier report to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--no-stall-check', dest='stall_check', action='store_false',
+                        help="skip checking that a run whose commit list stalls posts nothing")
+    args = parser.parse_args()
+    os.makedirs(args.work_dir, exist_ok=True)
+
+    results = []
+    for size, backend, source in itertools.product([int(s) for s in args.sizes.split(',')],
+                                                   args.backends.split(','), args.sources.split(',')):
+        for r in run_scenario(args, size, backend, source):
+            results.append(r)
+            print(f"{r['commits']:>6} {r['backend']:<7} {r['source']:<7} {r['run']:<4} "
+                  f"exit {r['exit_code']}  {r['wall_s']:7.3f}s  {r['api_calls']:4} calls  "
+                  f"{r['peak_rss_kib'] // 1024} MiB", file=sys.stderr)
+
+    stalled = None
+    if args.stall_check:
+        stall_results, stalled = stall_check(args)
+        results += stall_results
+        for r in stall_results:
+            print(f"  stall check {r['run']:<7} exit {r['exit_code']}  {r['wall_s']:7.3f}s  {r['api_calls']:4} calls",
+                  file=sys.stderr)
+
+    report = {
+        'generated_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'python': platform.python_version(),
+        'config': {'latency_s': args.latency, 'rate_limit': args.rate_limit, 'window_s': args.window,
+                   'skip_unchanged': args.skip_unchanged},
+        'results': results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    failed = [r for r in results if r['exit_code']]
+    for r in failed:
+        print(f"run failed: {'/'.join(map(str, key_of(r)))} (see {args.work_dir})", file=sys.stderr)
+    slower = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            slower = regressions(results, json.load(f), args.tolerance)
+        for line in slower:
+            print(f"regression: {line}", file=sys.stderr)
+    if stalled:
+        print(f"stall check: {stalled}", file=sys.stderr)
+    return 1 if failed or slower or stalled else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
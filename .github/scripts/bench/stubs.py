@@ -0,0 +1,286 @@
+"""
+Local stand-ins for the GitHub REST/GraphQL, Telegram Bot and Discord APIs.
+
+Each API is served by its own local HTTP server (so the client keeps one
+connection pool per host, as it does in CI) and answers from a synthetic
+repo and its manifest (see synth.py). Every response can be delayed by a
+fixed latency, and each API enforces a request budget per time window the
+way the real one reports it: GitHub's X-RateLimit-* headers and rate-limit
+403s, Discord's per-route buckets and 429 + retry_after, Telegram's 429 +
+parameters.retry_after. Calls, payload bytes, 304s and rate-limited
+responses are counted per API and per endpoint. `stall` holds matching
+GitHub requests for a while before answering, like a degraded API.
+"""
+
+import re, json, time, base64, hashlib, threading, subprocess
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+UPDATED_AT = '2024-01-01T00:00:00Z'
+
+_ID = re.compile(r'/(?:\d+|[0-9a-f]{40})(?=/|$|\?)')
+
+def endpoint_of(method, path):
+    """'GET /repos/o/r/issues/12' → 'GET /repos/o/r/issues/:id' (query string dropped)."""
+    return f"{method} {_ID.sub('/:id', path.split('?')[0])}"
+
+class Limiter:
+    """`limit` requests per `window` seconds for each bucket; None disables it."""
+
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.window = window
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def take(self, bucket):
+        """(allowed, remaining, reset_at) after counting one request against `bucket`."""
+        now = time.time()
+        with self.lock:
+            used, reset_at = self.buckets.get(bucket, (0, now + self.window))
+            if reset_at <= now:
+                used, reset_at = 0, now + self.window
+            if self.limit is None:
+                return True, 1_000_000, reset_at
+            allowed = used < self.limit
+            used += allowed
+            self.buckets[bucket] = (used, reset_at)
+            return allowed, self.limit - used, reset_at
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.apis = {}
+        self.endpoints = Counter()
+
+    def record(self, api, endpoint, status, sent, received):
+        with self.lock:
+            a = self.apis.setdefault(api, {'calls': 0, 'bytes_sent': 0, 'bytes_received': 0,
+                                           'not_modified': 0, 'rate_limited': 0, 'errors': 0})
+            a['calls'] += 1
+            a['bytes_sent'] += sent          # request bodies, client → stub
+            a['bytes_received'] += received  # response bodies, stub → client
+            a['not_modified'] += status == 304
+            a['rate_limited'] += status in (403, 429)
+            a['errors'] += status >= 400 and status not in (403, 429)
+            self.endpoints[f"{api} {endpoint}"] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return {'apis': json.loads(json.dumps(self.apis)), 'endpoints': dict(self.endpoints)}
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.dispatch('GET')
+
+    def do_POST(self):
+        self.dispatch('POST')
+
+    def do_PATCH(self):
+        self.dispatch('PATCH')
+
+    def dispatch(self, method):
+        length = int(self.headers.get('Content-Length') or 0)
+        data = self.rfile.read(length) if length else b''
+        stub = self.server.stub
+        if stub.latency:
+            time.sleep(stub.latency)
+        api = self.server.api
+        if api == 'github' and self.path == '/graphql':
+            api = 'graphql'
+        status, payload, headers = getattr(stub, f'handle_{self.server.api}')(method, self.path, data, self.headers)
+        body = b'' if payload is None else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+        stub.stats.record(api, endpoint_of(method, self.path), status, len(data), len(body))
+
+class StubAPIs:
+    def __init__(self, repo, manifest, latency=0.0, rate_limit=None, window=60.0, stall=None):
+        self.repo = repo
+        self.manifest = manifest
+        self.latency = latency
+        self.stall = stall     # (path regex, seconds) for GitHub requests to hold, or None
+        self.limiter = Limiter(rate_limit, window)
+        self.stats = Stats()
+        self.variables = {}
+        self.next_message_id = 1000
+        self.lock = threading.Lock()
+        self._compare = {}     # (base, head) → compare commits
+        self.servers = {}
+
+    # ── Lifecycle ────────────────────────────────────────────────────────────
+
+    def start(self):
+        """Start one server per API and return their base URLs."""
+        for api in ('github', 'telegram', 'discord'):
+            server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+            server.daemon_threads = True
+            server.api = api
+            server.stub = self
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self.servers[api] = server
+        base = {api: f"http://127.0.0.1:{s.server_port}" for api, s in self.servers.items()}
+        return {
+            'GITHUB_API_URL': base['github'],
+            'GITHUB_GRAPHQL_URL': base['github'] + '/graphql',
+            'TELEGRAM_API_URL': base['telegram'],
+            'DISCORD_API_URL': base['discord'] + '/api/v10',
+        }
+
+    def stop(self):
+        for server in self.servers.values():
+            server.shutdown()
+            server.server_close()
+
+    # ── Data ────────────────────────────────────────────────────────────────
+
+    def pr(self, number):
+        body = self.manifest['pr_bodies'].get(str(number))
+        if body is None:
+            return None
+        return {'number': int(number), 'body': body, 'updated_at': UPDATED_AT,
+                'pull_request': {'url': f'/pulls/{number}'}}
+
+    def issue(self, number):
+        body = self.manifest['issues'].get(str(number))
+        if body is None:
+            return self.pr(number)
+        return {'number': int(number), 'body': body, 'updated_at': UPDATED_AT}
+
+    def commit_pr(self, sha):
+        number = self.manifest['prs'].get(sha)
+        return self.pr(number) if number else None
+
+    def compare_commits(self, base, head):
+        """base..head oldest first, as the compare API lists them (base 'main' is origin/main)."""
+        base = 'origin/main' if base == 'main' else base
+        with self.lock:
+            if (base, head) not in self._compare:
+                out = subprocess.run(['git', 'log', '--reverse', '--format=%H%x1f%B%x1e', f'{base}..{head}'],
+                                     cwd=self.repo, capture_output=True, text=True).stdout
+                self._compare[base, head] = [{'sha': sha.strip(), 'commit': {'message': message.strip('\n')}}
+                                             for sha, message in (r.split('\x1f', 1) for r in out.split('\x1e')
+                                                                  if r.strip())]
+            return self._compare[base, head]
+
+    def compare_files(self, base, head):
+        base = 'origin/main' if base == 'main' else base
+        out = subprocess.run(['git', 'diff', '--name-only', f'{base}...{head}'],
+                             cwd=self.repo, capture_output=True, text=True).stdout
+        return [{'filename': name} for name in out.splitlines()]
+
+    # ── GitHub ──────────────────────────────────────────────────────────────
+
+    def handle_github(self, method, path, data, headers):
+        if self.stall and re.search(self.stall[0], path):
+            time.sleep(self.stall[1])
+        resource = 'graphql' if path == '/graphql' else 'core'
+        allowed, remaining, reset_at = self.limiter.take(f'github:{resource}')
+        limit_headers = {'X-RateLimit-Limit': str(self.limiter.limit or 5000),
+                         'X-RateLimit-Remaining': str(remaining),
+                         'X-RateLimit-Reset': str(int(reset_at) + 1),
+                         'X-RateLimit-Resource': resource}
+        if not allowed:
+            return 403, {'message': 'API rate limit exceeded'}, limit_headers
+        status, payload = self.github_route(method, path, data)
+        extra = {}
+        if status == 200 and method == 'GET':
+            etag = '"%s"' % hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+            extra['ETag'] = etag
+            if headers.get('If-None-Match') == etag:
+                status, payload = 304, None
+        return status, payload, {**limit_headers, **extra}
+
+    def github_route(self, method, path, data):
+        if path == '/graphql':
+            return 200, self.graphql(json.loads(data)['query'])
+        path = re.sub(r'^/repos/[^/]+/[^/]+/', '', path)
+        if m := re.fullmatch(r'commits/([0-9a-f]{40})/pulls', path):
+            pr = self.commit_pr(m.group(1))
+            return 200, [pr] if pr else []
+        if m := re.fullmatch(r'issues/(\d+)', path):
+            item = self.issue(m.group(1))
+            return (200, item) if item else (404, {'message': 'Not Found'})
+        if path.startswith('issues?'):
+            return 200, []      # nothing edited since the last run
+        if m := re.fullmatch(r'compare/([\w/-]+)\.\.\.([\w/.-]+?)(?:\?per_page=(\d+)&page=(\d+))?', path):
+            per_page, page = int(m.group(3) or 250), int(m.group(4) or 1)
+            commits = self.compare_commits(m.group(1), m.group(2))
+            return 200, {'total_commits': len(commits), 'ahead_by': len(commits),
+                         'commits': commits[(page - 1) * per_page:page * per_page],
+                         'files': self.compare_files(m.group(1), m.group(2)) if page == 1 else []}
+        if m := re.fullmatch(r'contents/([^?]+)\?ref=(\w+)', path):
+            result = subprocess.run(['git', 'show', f'{m.group(2)}:{m.group(1)}'],
+                                    cwd=self.repo, capture_output=True)
+            if result.returncode:
+                return 404, {'message': 'Not Found'}
+            return 200, {'encoding': 'base64', 'content': base64.b64encode(result.stdout).decode()}
+        if (m := re.fullmatch(r'actions/variables\?per_page=(\d+)&page=(\d+)', path)) and method == 'GET':
+            per_page, page = int(m.group(1)), int(m.group(2))
+            with self.lock:
+                items = [{'name': k, 'value': v} for k, v in sorted(self.variables.items())]
+            return 200, {'total_count': len(items), 'variables': items[(page - 1) * per_page:page * per_page]}
+        if path.startswith('actions/variables') and method in ('PATCH', 'POST'):
+            var = json.loads(data)
+            with self.lock:
+                self.variables[var['name']] = var['value']
+            return (204 if method == 'PATCH' else 201), None
+        return 404, {'message': 'Not Found'}
+
+    def graphql(self, query):
+        repo = {}
+        for alias, sha in re.findall(r'(c\d+): object\(oid: "([0-9a-f]+)"\)', query):
+            pr = self.commit_pr(sha)
+            nodes = [{'number': pr['number'], 'body': pr['body'], 'updatedAt': pr['updated_at']}] if pr else []
+            repo[alias] = {'associatedPullRequests': {'nodes': nodes}}
+        for alias, number in re.findall(r'(i\d+): issueOrPullRequest\(number: (\d+)\)', query):
+            item = self.issue(number)
+            repo[alias] = item and {'number': item['number'], 'body': item['body'], 'updatedAt': item['updated_at']}
+        return {'data': {'repository': repo}}
+
+    # ── Chat platforms ──────────────────────────────────────────────────────
+
+    def new_message_id(self):
+        with self.lock:
+            self.next_message_id += 1
+            return self.next_message_id
+
+    def handle_telegram(self, method, path, data, headers):
+        allowed, _, reset_at = self.limiter.take('telegram')
+        if not allowed:
+            return 429, {'ok': False, 'error_code': 429, 'description': 'Too Many Requests',
+                         'parameters': {'retry_after': round(reset_at - time.time(), 3)}}, {}
+        params = json.loads(data or b'{}')
+        if path.endswith('/sendMessage'):
+            return 200, {'ok': True, 'result': {'message_id': self.new_message_id()}}, {}
+        if path.endswith('/editMessageText'):
+            return 200, {'ok': True, 'result': {'message_id': params.get('message_id')}}, {}
+        return 404, {'ok': False, 'error_code': 404, 'description': 'Not Found'}, {}
+
+    def handle_discord(self, method, path, data, headers):
+        route = endpoint_of(method, re.sub(r'/messages/\d+', '/messages/:id', path))
+        allowed, remaining, reset_at = self.limiter.take(f'discord:{route}')
+        limit_headers = {'X-RateLimit-Bucket': hashlib.sha1(route.encode()).hexdigest()[:12],
+                         'X-RateLimit-Limit': str(self.limiter.limit or 50),
+                         'X-RateLimit-Remaining': str(remaining),
+                         'X-RateLimit-Reset-After': f'{max(0.0, reset_at - time.time()):.3f}'}
+        if not allowed:
+            return 429, {'message': 'You are being rate limited.',
+                         'retry_after': round(reset_at - time.time(), 3), 'global': False}, limit_headers
+        if m := re.fullmatch(r'/api/v10/channels/\d+/messages(?:/(\d+))?', path):
+            message_id = m.group(1) or str(self.new_message_id())
+            return 200, {'id': message_id}, limit_headers
+        return 404, {'message': 'Unknown Channel', 'code': 10003}, limit_headers
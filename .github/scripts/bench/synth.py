@@ -0,0 +1,129 @@
+"""
+Synthetic repositories for the benchmark.
+
+make_repo() builds, with one `git fast-import`, a repo whose `dev` branch is
+N commits ahead of `origin/main`, with a mix of commit kinds resembling the
+real history: feat/fix commits (squash-merged "(#123)", "PR: #123" trailers,
+plain subjects whose PR only the API knows, direct "#45" issue references),
+chores, docs, merges and version bumps. In .git/bench-manifest.json a manifest
+records which PR each commit belongs to and what the PR/issue bodies say, so
+the stub GitHub API can answer for it.
+"""
+
+import os, json, random, subprocess
+
+BASE_VERSION = '1.4.0'
+
+# (weight, kind) — kinds are expanded by commit_message()
+MIX = [
+    (20, 'feat-squash'), (8, 'feat-plain'), (5, 'feat-trailer'), (4, 'feat-issue'),
+    (12, 'fix-squash'), (6, 'fix-plain'), (4, 'fix-issue'), (3, 'direct'),
+    (10, 'chore'), (8, 'docs'), (4, 'refactor'), (3, 'ci'),
+    (5, 'merge'), (4, 'bump'), (4, 'noise'),
+]
+
+TOPICS = ['pawn mood tool', 'raid warning', 'colony overview', 'chat history', 'provider settings',
+          'trade summary', 'research queue', 'prompt caching', 'work priorities', 'map search',
+          'medical report', 'faction relations', 'weather forecast', 'storage audit', 'event log']
+NOISE = ['add using system', 'ensure all fixes', 'sanitize ci', 'translations docs', 'update claude.md']
+
+def commit_message(kind, rnd, pr, issue):
+    topic = rnd.choice(TOPICS)
+    kind, _, style = kind.partition('-')
+    if kind in ('feat', 'fix'):
+        verb = 'add' if kind == 'feat' else 'handle'
+        scope = rnd.choice(['', '(ui)', '(chat)', '(tools)'])
+        subject = f"{kind}{scope}: {verb} {topic}"
+        if style == 'squash':
+            return f"{subject} (#{pr})\n\nCloses #{issue}" if rnd.random() < 0.3 else f"{subject} (#{pr})"
+        if style == 'trailer':
+            return f"{subject}\n\nPR: #{pr}"
+        if style == 'issue':
+            return f"{subject} #{issue}"
+        return subject
+    if kind == 'direct':
+        return f"Tweak {topic} wording #{issue}"
+    if kind == 'merge':
+        return f"Merge pull request #{pr} from contributor/{topic.replace(' ', '-')}"
+    if kind == 'bump':
+        return f"chore: bump version to {BASE_VERSION}.{rnd.randint(1, 999)} [skip ci]"
+    if kind == 'noise':
+        return rnd.choice(NOISE)
+    return f"{kind}: tidy {topic}"
+
+def pr_body(rnd, issue):
+    lines = [f"Closes #{issue}", '', 'Adds the thing.', '', '## Testing']
+    lines += [f'- "Ask the colony about {rnd.choice(TOPICS)} please"' for _ in range(rnd.randint(0, 3))]
+    return '\n'.join(lines)
+
+def issue_body(rnd):
+    if rnd.random() < 0.5:
+        return 'Would be nice to have.'
+    prompts = [f'- "What is the {rnd.choice(TOPICS)} today?"' for _ in range(rnd.randint(1, 4))]
+    return '\n'.join(['Feature request.', '', '## Example Test Prompts'] + prompts)
+
+def _data(text):
+    raw = text.encode()
+    return b'data %d\n%s\n' % (len(raw), raw)
+
+def make_repo(path, commits, seed=0):
+    """Create the repo at `path` (which must not exist) and return its manifest."""
+    rnd = random.Random(seed)
+    kinds = [k for w, k in MIX for _ in range(w)]
+    issue_count = max(10, commits // 5)
+    next_pr = issue_count + 1     # issues and PRs share one number sequence
+
+    stream = bytearray()
+    ts = 1_700_000_000
+    about = f'<ModMetaData>\n  <version>{BASE_VERSION}</version>\n</ModMetaData>\n'
+    stream += b'commit refs/heads/main\nmark :1\n'
+    stream += b'committer Bench <bench@example.com> %d +0000\n' % ts
+    stream += _data('Initial release 1.4.0')
+    stream += b'M 100644 inline About/About.xml\n' + _data(about)
+    stream += b'reset refs/remotes/origin/main\nfrom :1\n\n'
+
+    manifest = {'prs': {}, 'pr_bodies': {}, 'issues': {}}
+    commit_prs = []              # mark → PR number (None for direct pushes)
+    for i in range(commits):
+        kind = rnd.choice(kinds)
+        # Squash, trailer and merge commits name their PR; most others still have one
+        needs_pr = kind.endswith(('-squash', '-trailer')) or kind == 'merge'
+        pr = next_pr if needs_pr or (kind not in ('direct', 'noise') and rnd.random() < 0.9) else None
+        if pr:
+            next_pr += 1
+        issue = rnd.randint(1, issue_count)
+        message = commit_message(kind, rnd, pr, issue)
+        if pr:
+            manifest['pr_bodies'][str(pr)] = pr_body(rnd, issue)
+        commit_prs.append(pr)
+        stream += b'commit refs/heads/dev\nmark :%d\n' % (i + 2)
+        stream += b'committer Bench <bench@example.com> %d +0000\n' % (ts + 60 * (i + 1))
+        stream += _data(message)
+        stream += b'from :%d\n' % (i + 1)
+        stream += b'M 100644 inline Source/File%d.cs\n' % (i % 64) + _data(f'// {i}\n')
+        stream += b'\n'
+    for n in range(1, issue_count + 1):
+        manifest['issues'][str(n)] = issue_body(rnd)
+
+    subprocess.run(['git', 'init', '-q', path], check=True)
+    subprocess.run(['git', 'fast-import', '--quiet', '--export-marks=.git/bench-marks'],
+                   cwd=path, input=bytes(stream), check=True)
+    subprocess.run(['git', 'symbolic-ref', 'HEAD', 'refs/heads/dev'], cwd=path, check=True)
+    subprocess.run(['git', 'reset', '-q', '--hard'], cwd=path, check=True)
+    with open(os.path.join(path, '.git', 'bench-marks')) as f:
+        marks = dict(line.split() for line in f)
+    for mark, pr in enumerate(commit_prs, start=2):
+        if pr:
+            manifest['prs'][marks[f':{mark}']] = pr
+
+    with open(os.path.join(path, '.git', 'bench-manifest.json'), 'w') as f:
+        json.dump(manifest, f)
+    return manifest
+
+def ensure_repo(path, commits, seed=0):
+    """Reuse a repo generated earlier with the same size, or make it."""
+    try:
+        with open(os.path.join(path, '.git', 'bench-manifest.json')) as f:
+            return json.load(f)
+    except OSError:
+        return make_repo(path, commits, seed)
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Updates every status message listed in a batch config (several branches,
+forks and chats) in one run, sharing lookups between them.
+
+    dev-status-batch.py [CONFIG]   (default: DEV_STATUS_BATCH or dev-status-batch.json next to this script)
+
+See devstatus/batch.py for the config format.
+"""
+
+import sys
+
+from devstatus import batch, metrics, update
+
+def main():
+    batch.run(sys.argv[1] if len(sys.argv) > 1 else batch.BATCH_PATH)
+    print("Done.")
+
+if __name__ == '__main__':
+    try:
+        metrics.profiled(main)
+    finally:
+        update.record_counters()
+        metrics.write()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Writes release notes for whole ranges of history with the status pipeline
+(commit → PR → issue → example prompts), grouped by the version at each tag.
+
+    dev-status-changelog.py [--from REV] [--to REF] [--out CHANGELOG.md] [--format md|json]
+                            [--no-prompts] [--repo OWNER/NAME] [--path CLONE]
+
+Needs full history and tags (fetch-depth: 0) and GH_TOKEN; GraphQL
+(DEV_STATUS_BACKEND=graphql) resolves 100 commits per request. Progress is
+kept in the cache directory, so rerunning after an interruption continues
+where it stopped. See devstatus/changelog.py.
+"""
+
+import sys, argparse
+
+from devstatus import changelog, github, metrics, update
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--from', dest='since', help='leave out everything this rev already contains')
+    parser.add_argument('--to', default='HEAD', help='newest commit to include (default HEAD)')
+    parser.add_argument('--out', default='CHANGELOG.md')
+    parser.add_argument('--format', choices=('md', 'json'), help='default: from the --out extension')
+    parser.add_argument('--no-prompts', dest='prompts', action='store_false',
+                        help="skip issue bodies that are only needed for example prompts")
+    parser.add_argument('--repo', default=github.REPO)
+    parser.add_argument('--path', help='local clone (default: the working directory)')
+    args = parser.parse_args()
+
+    releases = changelog.build(args.to, args.since, args.repo, args.path, args.prompts)
+    changelog.write(releases, args.out, args.format, args.repo)
+    update.print_stats()
+    update.print_rate_limits()
+    return 0
+
+if __name__ == '__main__':
+    try:
+        sys.exit(metrics.profiled(main))
+    finally:
+        update.record_counters()
+        metrics.write()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Long-running alternative to the dev-status workflow: updates the status
+messages within seconds of a push instead of after an Actions job starts.
+
+    dev-status-server.py serve [--host 127.0.0.1] [--port 8080] [--repo PATH]
+                               [--debounce 3] [--max-delay 15] [--record DIR]
+    dev-status-server.py replay PAYLOAD.json [PAYLOAD.json …] [--url URL] [--event push]
+
+`serve` expects a full clone of the repository at --repo (default: the
+current directory) with `origin` pointing at GitHub, the same environment
+as the workflow step (GH_TOKEN, the bot tokens and *_STATUS_MESSAGE_ID /
+*_STATUS_HASH) plus DEV_STATUS_WEBHOOK_SECRET, the secret configured on the
+repository's push webhook. `replay` signs saved payloads (for example the
+ones `serve --record` wrote) with the same secret and posts them to a
+running server.
+"""
+
+import os, sys, argparse
+
+from devstatus import server
+from devstatus.sinks import configured_sinks
+
+def serve(args):
+    os.chdir(args.repo)
+    sinks = configured_sinks()
+    if not sinks:
+        print("No sinks configured (set TELEGRAM_BOT_TOKEN and/or DISCORD_BOT_TOKEN)")
+        return 1
+    for s in sinks:
+        print(f"{s.name}: {s.describe()}, existing message ID: {s.message_id or 'none'}")
+    try:
+        status_server = server.StatusServer(sinks, debounce=args.debounce, max_delay=args.max_delay,
+                                            record_dir=args.record and os.path.abspath(args.record))
+    except ValueError as e:
+        print(f"Cannot start: {e}")
+        return 1
+    status_server.serve(args.host, args.port)
+
+def replay(args):
+    failed = 0
+    for path in args.payloads:
+        status, reply = server.replay(args.url, path, event=args.event)
+        print(f"{path}: HTTP {status} {reply}")
+        failed += status >= 300
+    return 1 if failed else 0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    p = commands.add_parser('serve', help='receive push webhooks and keep the messages current')
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--port', type=int, default=8080)
+    p.add_argument('--repo', default='.', help='full clone to read commits from')
+    p.add_argument('--debounce', type=float, default=3.0, help='quiet seconds that end a burst of pushes')
+    p.add_argument('--max-delay', type=float, default=15.0, help='longest wait after the first push of a burst')
+    p.add_argument('--record', help='save every verified delivery here for later replay')
+    p.set_defaults(run=serve)
+
+    p = commands.add_parser('replay', help='post saved webhook payloads to a running server')
+    p.add_argument('payloads', nargs='+')
+    p.add_argument('--url', default='http://127.0.0.1:8080/')
+    p.add_argument('--event', help="X-GitHub-Event for raw payloads (default 'push')")
+    p.set_defaults(run=replay)
+
+    args = parser.parse_args()
+    return args.run(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
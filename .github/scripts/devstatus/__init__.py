@@ -0,0 +1,7 @@
+"""
+Shared pipeline for the "Testable on Dev" status messages.
+
+The unreleased commits are collected and resolved against GitHub once into a
+platform-neutral Status (core), then rendered and posted by each configured
+sink (Telegram, Discord) in parallel.
+"""
@@ -0,0 +1,130 @@
+"""
+Batch mode: many status messages (branches of this repository and of forks)
+from one config file, in one process.
+
+    {
+      "defaults": {"repo": "Bwarhness/RimMind", "base": "main",
+                   "telegram": {"chat_id": "-1003732082318"}},
+      "targets": [
+        {"name": "beta", "branch": "beta",
+         "telegram": {"thread_id": "${TELEGRAM_BETA_THREAD_ID}"},
+         "discord": {"channel_id": "123456789012345678"}},
+        {"name": "fork-dev", "repo": "someone/RimMind", "branch": "dev", "path": "../fork",
+         "discord": {"channel_id": "123456789012345679", "variables_repo": "Bwarhness/RimMind"}}
+      ]
+    }
+
+Each target lists the unreleased commits of `branch` (`head` in the local
+clone at `path`, default origin/<branch> in the working directory) against
+`base` and posts to the sinks it names; sink settings are merged over the
+defaults and ${VARS} are taken from the environment. The bot tokens come
+from the environment as usual. Message IDs and hashes are kept in Actions
+variables of `variables_repo` (default: the target's repo), named like the
+single-target ones plus _<NAME>, e.g. TELEGRAM_STATUS_MESSAGE_ID_BETA,
+unless message_var / hash_var say otherwise. With DEV_STATUS_LEASE=variable
+the target's lease lives in the same repository, so all sinks of a target
+must use one `variables_repo`.
+
+Targets run concurrently and share everything that doesn't depend on the
+branch: per repository one Resolver (PR and issue bodies, commit → PR
+lookups) and one commit index, and overall the response cache, connection
+pool and rate-limit pacing. Branches mostly share history, so after the
+first one a target usually only resolves its own commits.
+"""
+
+import os, json, traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from . import cache, core, git, github, source, update
+from . import lease as leases
+from .index import CommitIndex, path_for
+from .sinks import SINK_TYPES, sinks_from_config
+from .targets import Target
+
+BATCH_PATH = os.environ.get('DEV_STATUS_BATCH') or \
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dev-status-batch.json')
+BATCH_WORKERS = 4
+
+def expand(value):
+    if isinstance(value, dict):
+        return {k: expand(v) for k, v in value.items()}
+    return os.path.expandvars(value) if isinstance(value, str) else value
+
+def load(path=BATCH_PATH):
+    """[(Target without sinks, its merged config)] from a batch config file."""
+    with open(path) as f:
+        config = json.load(f)
+    defaults = config.get('defaults', {})
+    sink_names = {t.name for t in SINK_TYPES}
+    entries = []
+    for raw in config['targets']:
+        cfg = {k: v for k, v in defaults.items() if k not in sink_names}
+        for k, v in raw.items():
+            cfg[k] = {**defaults.get(k, {}), **v} if k in sink_names else v
+        cfg = expand(cfg)
+        branch = cfg.get('branch', cfg['name'])
+        entries.append((Target(name=cfg['name'], repo=cfg.get('repo', github.REPO), branch=branch,
+                               head=cfg.get('head', f'origin/{branch}'), base=cfg.get('base', git.DEFAULT_BRANCH),
+                               path=cfg.get('path')), cfg))
+    return entries
+
+def variables_repos(entries):
+    return {cfg[t.name].get('variables_repo', target.repo)
+            for target, cfg in entries for t in SINK_TYPES if cfg.get(t.name)}
+
+def run_target(target, cfg, variables, commit_index, resolver):
+    """Update one target; returns its log lines so concurrent targets don't interleave."""
+    log = [f"══ {target.name}: {target.repo} {target.branch} ══"]
+    try:
+        target.sinks = sinks_from_config(cfg, target.name, target.repo, variables)
+        if not target.sinks:
+            log.append("No sinks configured — skipped")
+            return log
+        try:
+            lease = leases.for_target(target)
+        except ValueError as e:
+            log.append(f"{e} — skipped")
+            return log
+        if lease and (reason := lease.claim(variables.get(lease.repo) if lease.repo else None)):
+            log.append(f"Superseded: {reason} — skipped")
+            return log
+        try:
+            resolved = update.resolve(target, commit_index, resolver)
+        except source.SourceUnavailable as e:
+            log.append(f"Unreleased commits unavailable ({e}) — keeping the existing messages")
+            return log
+        if resolved is None:
+            log.append("Feature commits and version unchanged since last post — nothing to do.")
+            return log
+        if lease and not update.ready_to_post(lease, target.sinks, log.append):
+            return log
+        status, inputs = resolved
+        log.append(f"Version {status.version}, {len(status.features)} features")
+        log += update.publish_all(target.sinks, status, inputs)
+    except Exception:
+        log.append(traceback.format_exc())
+    return log
+
+def run(path=BATCH_PATH):
+    entries = load(path)
+    print(f"{len(entries)} targets from {path}")
+    # One listing per repository instead of two variable reads per sink
+    variables = {repo: github.gh_list_variables(repo) for repo in variables_repos(entries)}
+    with ThreadPoolExecutor(max_workers=core.RESOLVE_WORKERS) as lookups:
+        shared = {}   # repo → (CommitIndex, Resolver)
+        for target, cfg in entries:
+            if target.repo not in shared:
+                commit_index = CommitIndex(path_for(target.repo), target.repo)
+                commit_index.refresh()
+                shared[target.repo] = commit_index, core.Resolver(lookups, target.repo)
+
+        with ThreadPoolExecutor(max_workers=BATCH_WORKERS) as pool:
+            futures = [pool.submit(run_target, target, cfg, variables, *shared[target.repo]) for target, cfg in entries]
+            for future in as_completed(futures):
+                print('\n'.join(future.result()))
+
+    for commit_index, resolver in shared.values():
+        commit_index.save()
+    cache.prune()
+    update.print_stats()
+    update.print_rate_limits()
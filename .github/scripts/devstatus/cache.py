@@ -0,0 +1,86 @@
+"""
+On-disk cache for GitHub REST responses.
+
+Responses are keyed by URL and revalidated with If-None-Match /
+If-Modified-Since. GitHub does not charge 304s against the rate limit, so a
+warm cache (restored between workflow runs) makes repeat runs nearly free.
+Incremental listings (`?since=<timestamp>`) and compares against a commit
+sha are not cached: their URL changes with every run or push, so an entry
+would never be asked for again.
+"""
+
+import os, re, json, hashlib, threading, time
+
+CACHE_DIR       = os.environ.get('DEV_STATUS_CACHE_DIR', '.dev-status-cache')
+CACHE_MAX_AGE   = 30 * 24 * 3600     # evict entries not revalidated for 30 days
+CACHE_MAX_BYTES = 20 * 1024 * 1024   # then evict least recently used down to 20 MB
+
+# Response files are named by URL hash; the commit indexes and leases.json
+# share the directory but are not responses and are never pruned
+_RESPONSE = re.compile(r'[0-9a-f]{64}\.json')
+# One-off URLs: incremental listings, compares with a sha on either side
+_UNCACHED = re.compile(r'[?&]since=|/compare/(?:[0-9a-f]{40}\.\.\.|[^?]*\.\.\.[0-9a-f]{40}(?:\?|$))')
+
+stats = {'hit': 0, 'miss': 0}
+_lock = threading.Lock()
+_memory = {}          # path → entry, so a long-lived process reads each file once
+
+def path_for(url):
+    return os.path.join(CACHE_DIR, hashlib.sha256(url.encode()).hexdigest() + '.json')
+
+def load(url):
+    if _UNCACHED.search(url):
+        return None
+    path = path_for(url)
+    entry = _memory.get(path)
+    if entry is not None:
+        return entry
+    try:
+        with open(path) as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    _memory[path] = entry
+    return entry
+
+def store(url, headers, data):
+    etag, last_modified = headers.get('ETag'), headers.get('Last-Modified')
+    if (not etag and not last_modified) or _UNCACHED.search(url):
+        return
+    path = path_for(url)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        entry = {'url': url, 'etag': etag, 'last_modified': last_modified, 'data': data}
+        with open(tmp, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+        _memory[path] = entry
+    except OSError as e:
+        print(f"  cache write {url} failed: {e}")
+
+def touch(url):
+    try:
+        os.utime(path_for(url))
+    except OSError:
+        pass
+
+def count(outcome):
+    with _lock:
+        stats[outcome] += 1
+
+def prune():
+    """Evict stale response files, then the least recently used ones over CACHE_MAX_BYTES."""
+    try:
+        entries = [e for e in os.scandir(CACHE_DIR) if _RESPONSE.fullmatch(e.name)]
+    except OSError:
+        return
+    now = time.time()
+    entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    total = 0
+    for e in entries:
+        st = e.stat()
+        total += st.st_size
+        if now - st.st_mtime > CACHE_MAX_AGE or total > CACHE_MAX_BYTES:
+            os.remove(e.path)
+            _memory.pop(e.path, None)
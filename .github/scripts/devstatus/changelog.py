@@ -0,0 +1,183 @@
+"""
+Changelog mode: the status pipeline (commit → PR → issue → prompts) over
+whole release ranges instead of the newest MAX_FEATURES features.
+
+Tags reachable from `to` split the history into releases, each titled with
+the <version> in About/About.xml at its tag; commits after the last tag form
+an "Unreleased" section. `since` (any rev, usually a tag) leaves out
+everything it already contains. Within a release, entries are deduplicated
+by issue like the status message.
+
+Commits are resolved in shards of SHARD_SIZE that run in parallel and share
+one Resolver, so an issue linked from many commits is fetched once. Results
+go to a commit index of their own, one per repository (changelog-index.json
+in the cache directory, see path_for), so status runs keep loading a small
+one. It is checkpointed as shards finish: an interrupted run resumes where
+it stopped, and a rerun only resolves commits it hasn't seen.
+"""
+
+import os, json, time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timezone
+
+from . import cache, core, git, github, metrics
+from .index import CommitIndex
+from .rules import classify
+
+SHARD_SIZE       = 500
+SHARD_WORKERS    = 4
+CHECKPOINT_EVERY = 30     # seconds between index saves
+INDEX_PATH       = os.path.join(cache.CACHE_DIR, 'changelog-index.json')
+
+@dataclass
+class Entry:
+    sha: str
+    title: str
+    pr: str = None
+    issue: str = None
+    prompts: list = field(default_factory=list)
+
+@dataclass
+class Release:
+    version: str
+    tag: str                   # None for the unreleased commits
+    sha: str
+    date: str
+    entries: list = field(default_factory=list)
+
+def path_for(repo):
+    """Changelog index for `repo`: forks share shas but not PR/issue numbers."""
+    if repo == github.REPO:
+        return INDEX_PATH
+    return os.path.join(cache.CACHE_DIR, f"changelog-index-{repo.replace('/', '-')}.json")
+
+def release_ranges(to='HEAD', since=None, cwd=None):
+    """[(tag, sha, date, revs)] newest first; revs is the rev-list range of that release."""
+    ranges = []
+    prev = None
+    tags = git.release_tags(to, cwd)
+    for tag, sha, date in tags:
+        ranges.append((tag, sha, date, [f'{prev}..{tag}' if prev else tag]))
+        prev = tag
+    head = git.head_sha(to, cwd)
+    if not tags or tags[-1][1] != head:
+        ranges.append((None, head, None, [f'{prev}..{head}' if prev else head]))
+    if since:
+        ranges = [(tag, sha, date, revs + [f'^{since}']) for tag, sha, date, revs in ranges]
+    return ranges[::-1]
+
+def resolve_shard(commits, resolver, index, prompts):
+    """{sha: entry} for one shard; reads the shared index but leaves writing it to the caller."""
+    entries = {}
+    with metrics.phase('parse'):
+        for c in commits:
+            entry = dict(index.entries.get(c['sha']) or {})
+            if 'noise' not in entry:
+                noise, title, _ = classify(c['subject'])
+                entry.update(noise=noise, title=title)
+            entries[c['sha']] = entry
+    live = [(c, entries[c['sha']]) for c in commits if not entries[c['sha']]['noise']]
+    core.resolve_numbers([(c, e) for c, e in live if 'issue' not in e], resolver)
+    if prompts:
+        core.fetch_prompts([(c, e) for c, e in live if e.get('prompts') is None], resolver)
+    return entries
+
+def resolve_all(commits, index, repo, prompts):
+    """Resolve every commit into `index`, shard by shard, saving it along the way."""
+    todo = [c for c in commits if not done(index.entries.get(c['sha']), prompts)]
+    print(f"{len(commits) - len(todo)} commits already in the index, {len(todo)} to resolve")
+    lookups = ThreadPoolExecutor(max_workers=core.RESOLVE_WORKERS)
+    shards = ThreadPoolExecutor(max_workers=SHARD_WORKERS)
+    resolver = core.Resolver(lookups, repo)
+    futures = [shards.submit(resolve_shard, todo[i:i + SHARD_SIZE], resolver, index, prompts)
+               for i in range(0, len(todo), SHARD_SIZE)]
+    saved = time.monotonic()
+    try:
+        for n, future in enumerate(as_completed(futures), 1):
+            for sha, entry in future.result().items():
+                index.put(sha, **entry)
+            if time.monotonic() - saved > CHECKPOINT_EVERY:
+                index.save()
+                saved = time.monotonic()
+            print(f"  shard {n}/{len(futures)} done")
+    finally:
+        # On Ctrl-C or an error, keep what finished and don't start the rest
+        shards.shutdown(cancel_futures=True)
+        lookups.shutdown(cancel_futures=True)
+        index.save()
+    if (missed := sum(1 for c in todo if not done(index.entries.get(c['sha']), prompts))):
+        print(f"{missed} commits couldn't be fully resolved — a rerun retries them")
+
+def done(entry, prompts):
+    if not entry or 'noise' not in entry:
+        return False
+    return entry['noise'] or 'issue' in entry and (not prompts or entry.get('prompts') is not None)
+
+def build(to='HEAD', since=None, repo=github.REPO, cwd=None, prompts=True, index_path=None):
+    """[Release] newest first for the history up to `to`; the index defaults to path_for(repo)."""
+    with metrics.phase('git'):
+        ranges = [(tag, sha, date, list(git.iter_commits(revs, cwd))) for tag, sha, date, revs
+                  in release_ranges(to, since, cwd)]
+    ranges = [r for r in ranges if r[3]]
+    commits = [c for r in ranges for c in r[3]]
+    print(f"{len(commits)} commits in {len(ranges)} releases")
+
+    index = CommitIndex(index_path or path_for(repo), repo)
+    index.refresh()
+    with metrics.phase('resolve'):
+        resolve_all(commits, index, repo, prompts)
+
+    releases = []
+    for tag, sha, date, section in ranges:
+        release = Release(git.version_at(sha, cwd) or tag or '', tag, sha, date)
+        seen_issues = set()
+        for c in section:
+            entry = index.get(c['sha'])    # marks it seen, so it outlives INDEX_MAX_AGE while in use
+            if not entry or entry['noise']:
+                continue
+            issue = entry.get('issue')     # missing if its PR couldn't be looked up; a rerun fills it in
+            if issue and issue in seen_issues:
+                continue
+            seen_issues.add(issue)
+            release.entries.append(Entry(c['sha'], entry['title'], entry.get('pr'), issue,
+                                         entry.get('prompts') or []))
+        releases.append(release)
+    index.save()
+    return releases
+
+# ── Output ──────────────────────────────────────────────────────────────────
+
+def issue_link(repo, number):
+    # issues/{n} redirects to the PR when the number is one
+    return f"[#{number}](https://github.com/{repo}/issues/{number})"
+
+def to_markdown(releases, repo=github.REPO):
+    lines = ['# Changelog', '']
+    for r in releases:
+        heading = r.version if r.tag else f"Unreleased ({r.version})"
+        if r.tag and r.tag.lstrip('v') != r.version:
+            heading += f" ({r.tag})"
+        lines += [f"## {heading}" + (f" — {r.date}" if r.date else ''), '']
+        for e in r.entries:
+            line = f"- {issue_link(repo, e.issue)} — {e.title}" if e.issue else f"- {e.title}"
+            if e.pr and e.pr != e.issue:
+                line += f" ({issue_link(repo, e.pr)})"
+            lines.append(line)
+            lines += [f'  - _"{p}"_' for p in e.prompts]
+        if not r.entries:
+            lines.append('_No feature changes._')
+        lines.append('')
+    return '\n'.join(lines)
+
+def to_json(releases, repo=github.REPO):
+    return json.dumps({'repo': repo,
+                       'generated_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                       'releases': [asdict(r) for r in releases]}, indent=2)
+
+def write(releases, path, fmt=None, repo=github.REPO):
+    fmt = fmt or ('json' if path.endswith('.json') else 'md')
+    text = to_json(releases, repo) if fmt == 'json' else to_markdown(releases, repo)
+    with open(path, 'w') as f:
+        f.write(text)
+    print(f"Wrote {sum(len(r.entries) for r in releases)} entries in {len(releases)} releases to {path}")
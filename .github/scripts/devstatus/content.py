@@ -0,0 +1,60 @@
+"""Commit classification and PR/issue body parsing."""
+
+import re, itertools
+
+from . import markdown, rules
+
+# ── Commit subjects ─────────────────────────────────────────────────────────
+# The rules live in dev-status-rules.json; see rules.py.
+
+def is_noise(subject):
+    return rules.classify(subject).noise
+
+def rules_digest():
+    """Fingerprint of the classification rules, so cached classifications expire with them."""
+    return rules.RULES.digest
+
+def extract_issue_number(text):
+    # Prefer "closes/fixes #NNN" style, fall back to bare #NNN
+    return rules.RULES.issue_number(text)
+
+# ── Local PR / issue references ─────────────────────────────────────────────
+# Squash merges end in "(#123)", merge commits start "Merge pull request #123",
+# and some commits carry a "PR: #123" trailer. Any of these saves the
+# commits/{sha}/pulls lookup.
+
+PR_SUFFIX  = re.compile(r'\(#(\d+)\)\s*$')
+PR_MERGE   = re.compile(r'^Merge pull request #(\d+)', re.IGNORECASE)
+PR_TRAILER = re.compile(r'^(?:PR|Pull[- ]Request):\s*(?:#|\S*/pull/)(\d+)', re.IGNORECASE | re.MULTILINE)
+CLOSING_REF = re.compile(r'(?:%s):?\s+#(\d+)' % rules.alternation(rules.RULES.config['issue_keywords']),
+                         re.IGNORECASE)
+
+def local_pr_number(subject, body=''):
+    m = PR_SUFFIX.search(subject) or PR_MERGE.match(subject) or PR_TRAILER.search(body or '')
+    return m.group(1) if m else None
+
+def closing_issue_number(body):
+    """Issue closed by a commit body ("Closes #12", "Fixes: #12"), if any."""
+    m = CLOSING_REF.search(body or '')
+    return m.group(1) if m else None
+
+# ── PR / issue bodies ───────────────────────────────────────────────────────
+
+PROMPT_SECTIONS = [
+    re.compile(r'Example\s+Test\s+Prompts?', re.IGNORECASE),
+    re.compile(r'Test(?:ing|s?(?:\s+Prompts?)?)', re.IGNORECASE),
+]
+
+def extract_example_prompts(body, max_prompts=3):
+    """Extract prompts from '## Example Test Prompts' or '## Testing' section."""
+    if not body:
+        return []
+    index = markdown.index_for(body)
+    # Try Example Test Prompts first, then Testing
+    for title in PROMPT_SECTIONS:
+        prompts = list(itertools.islice(
+            (line for line in index.bullets(title) if not line.startswith('#') and len(line) > 5),
+            max_prompts))
+        if prompts:
+            return prompts
+    return []
@@ -0,0 +1,303 @@
+"""Collects the unreleased feature list once, independent of any chat platform."""
+
+import hashlib, itertools, threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from . import github, metrics
+from .index import CommitIndex, stats as index_stats
+from .content import (is_noise, extract_issue_number, extract_example_prompts,
+                      local_pr_number, closing_issue_number)
+from .rules import classify
+
+MAX_FEATURES = 8
+RESOLVE_WORKERS = 8
+FINGERPRINT_WINDOW = 4 * MAX_FEATURES   # feature commits covered by input_fingerprint
+
+# commits/{sha}/pulls lookups skipped thanks to local PR/issue references, plus
+# issue/PR body fetches answered by an earlier fetch of the same number.
+stats = {'avoided': 0}
+_stats_lock = threading.Lock()   # batch targets and lookup workers count concurrently
+
+def count_avoided(n=1):
+    with _stats_lock:
+        stats['avoided'] += n
+
+@dataclass
+class Feature:
+    sha: str
+    title: str                  # display title, prefix and (#PR) suffix removed
+    issue: str = None           # linked issue number, if any
+    prompts: list = field(default_factory=list)
+    partial: bool = False       # its issue or prompts couldn't be looked up (failed, or out of time)
+
+@dataclass
+class Status:
+    version: str
+    features: list
+
+    @property
+    def partial(self):
+        return any(f.partial for f in self.features)
+
+class Resolver:
+    """Fetches PR and issue bodies on demand, each at most once per run.
+
+    Safe to share between threads (batch mode resolves several branches of a
+    repository at once): a body another thread is already fetching is waited
+    for, not fetched again. Lookups that failed are not stored, so they are
+    missing from `bodies` / `commit_prs` rather than None.
+    """
+
+    def __init__(self, pool, repo=github.REPO):
+        self.pool = pool
+        self.repo = repo
+        self.bodies = {}       # issue/PR number → REST issue (or GraphQL node), None if missing
+        self.commit_prs = {}   # sha → associated PR, None if none
+        self.requested = set()
+        self.lock = threading.Lock()
+        self.inflight = {}     # (table, key) → Event set once the fetching thread stored it
+
+    def claim(self, table, keys):
+        """Split keys missing from `table` into (ours to fetch, our Event, Events to wait for)."""
+        mine, waits, event = [], [], threading.Event()
+        with self.lock:
+            for k in dict.fromkeys(keys):
+                if k in table:
+                    continue
+                other = self.inflight.get((id(table), k))
+                if other:
+                    waits.append(other)
+                else:
+                    self.inflight[(id(table), k)] = event
+                    mine.append(k)
+        return mine, event, waits
+
+    def release(self, table, keys, event, waits):
+        with self.lock:
+            for k in keys:
+                del self.inflight[(id(table), k)]
+        event.set()
+        for other in waits:
+            other.wait()
+
+    def issues(self, numbers):
+        with self.lock:
+            for n in filter(None, numbers):
+                if n in self.requested:
+                    count_avoided()
+                self.requested.add(n)
+        missing, event, waits = self.claim(self.bodies, filter(None, numbers))
+        try:
+            for n, issue in zip(missing, github.fetch_issues(missing, self.pool, self.repo)):
+                if issue is not github.UNAVAILABLE:
+                    self.bodies[n] = issue
+        finally:
+            self.release(self.bodies, missing, event, waits)
+        return [self.bodies.get(n) if n else None for n in numbers]
+
+    def prs(self, commits):
+        by_sha = {c['sha']: c for c in commits}
+        missing, event, waits = self.claim(self.commit_prs, by_sha)
+        try:
+            for sha, pr in zip(missing, github.fetch_prs([by_sha[s] for s in missing], self.pool, self.repo)):
+                if pr is github.UNAVAILABLE:
+                    continue
+                self.commit_prs[sha] = pr
+                if pr and pr.get('number'):
+                    # issues/{n} answers for PRs too, so this also covers later body lookups
+                    self.bodies.setdefault(str(pr['number']), pr)
+        finally:
+            self.release(self.commit_prs, missing, event, waits)
+        return [self.commit_prs.get(c['sha']) for c in commits]
+
+    def looked_up(self, commit, pr_num):
+        """True if the commit's PR (by number if known, else by sha) was fetched, found or not."""
+        return pr_num in self.bodies if pr_num else commit['sha'] in self.commit_prs
+
+def body_of(item):
+    return (item or {}).get('body') or ''
+
+def updated_at(item):
+    return (item or {}).get('updated_at')
+
+def resolve_features(commits, resolver, index, budget=None):
+    """Pick up to MAX_FEATURES features, resolving PRs/issues with as few calls as possible.
+
+    `commits` may be a lazy stream; it is only consumed as far as needed to
+    fill MAX_FEATURES, with noise filtered inline. Commits already in the
+    index reuse their stored classification, PR/issue numbers and prompts.
+    For the rest, PR numbers and issue references come from the commit
+    subject/body first; the network is only used for bodies that are still
+    needed. Candidates are processed in waves sized to the remaining slots,
+    so the serial rules (skip noise, dedupe by issue, stop at MAX_FEATURES)
+    still decide what is kept, while each wave's lookups run concurrently.
+
+    With a render.Budget, commits stop being resolved once no message has
+    room for another title, and prompt bodies are fetched in feature order
+    only while some message has room left for them.
+
+    Lookups that fail (or miss the run's deadline) don't hold the list up:
+    the feature is shown by its title, marked partial, and its index entry
+    is left for the next run to finish.
+    """
+    def classified():
+        for c in commits:
+            entry = index.get(c['sha'])
+            if entry is None:
+                with metrics.phase('parse'):
+                    noise, title, _ = classify(c['subject'])
+                entry = index.put(c['sha'], noise=noise, title=title)
+            if not entry['noise']:
+                yield c, entry
+    candidates = classified()
+
+    accepted = []              # (commit, index entry)
+    seen_issues = set()
+    examined = []
+    full = False
+
+    while len(accepted) < MAX_FEATURES and not full:
+        size = MAX_FEATURES - len(accepted)
+        if github.BACKEND == 'graphql':
+            size = max(size, github.GRAPHQL_CHUNK)  # a bigger wave still costs one query
+        wave = list(itertools.islice(candidates, size))
+        if not wave:
+            break
+
+        resolve_numbers([(c, entry) for c, entry in wave if 'issue' not in entry], resolver)
+
+        for c, entry in wave:
+            examined.append(c['sha'])
+            issue_num = entry.get('issue')
+            if issue_num and issue_num in seen_issues:
+                continue
+            if budget and not budget.take_title(entry['title'], issue_num):
+                full = True
+                break
+            if issue_num:
+                seen_issues.add(issue_num)
+            accepted.append((c, entry))
+            if len(accepted) >= MAX_FEATURES:
+                break
+
+    # Example prompts, in feature order, only while some message still has room for them
+    index_stats['reused'] += sum(1 for c, entry in accepted if entry.get('prompts') is not None)
+    todo = accepted
+    asked = set()              # id() of the entries whose prompts were asked for
+    while todo:
+        n = budget.prompt_slots() if budget else len(todo)
+        if n <= 0:
+            break
+        chunk, todo = todo[:n], todo[n:]
+        asked.update(id(entry) for c, entry in chunk)
+        fetch_prompts([(c, entry) for c, entry in chunk if entry.get('prompts') is None], resolver)
+        if budget:
+            for c, entry in chunk:
+                budget.take_prompts(entry['prompts'] or [])
+
+    count_avoided(sum(1 for sha in examined if sha not in resolver.commit_prs))
+    # Entries left without prompts keep None, so a later run with room fetches them
+    return [Feature(c['sha'], entry['title'], entry.get('issue'), entry['prompts'] or [],
+                    'issue' not in entry or (id(entry) in asked and entry['prompts'] is None))
+            for c, entry in accepted]
+
+def resolve_numbers(pending, resolver):
+    """Fill entry['pr'] / entry['issue'] for (commit, index entry) pairs not resolved yet.
+
+    An entry whose PR couldn't be looked up gets no 'issue' key, so it counts
+    as unresolved and a later run tries again.
+    """
+    local = []                 # (commit, entry, pr_num, issue_num)
+    for c, entry in pending:
+        local.append((c, entry, local_pr_number(c['subject'], c.get('body')),
+                      classify(c['subject']).issue or closing_issue_number(c.get('body'))))
+
+    # Without a local issue reference the PR body decides it
+    resolver.prs([c for c, entry, pr_num, issue_num in local if not pr_num and not issue_num])
+    resolver.issues([pr_num for c, entry, pr_num, issue_num in local if pr_num and not issue_num])
+
+    for c, entry, pr_num, issue_num in local:
+        updated = {}
+        if not issue_num:
+            if not resolver.looked_up(c, pr_num):
+                entry.update(pr=pr_num, prompts=None)
+                continue
+            pr = resolver.bodies.get(pr_num) if pr_num else resolver.commit_prs.get(c['sha'])
+            if pr and not pr_num and pr.get('number'):
+                pr_num = str(pr['number'])
+            if pr:
+                updated[pr_num] = updated_at(pr)
+            issue_num = extract_issue_number(body_of(pr))
+        entry.update(pr=pr_num, issue=issue_num, prompts=None, updated=updated)
+        index_stats['resolved'] += 1
+
+def fetch_prompts(pending, resolver):
+    """Fill entry['prompts'] — issue body first, PR body as fallback.
+
+    Entries not resolved to an issue yet, or whose bodies couldn't be
+    fetched, keep prompts None.
+    """
+    pending = [(c, entry) for c, entry in pending if 'issue' in entry]
+    issues = resolver.issues([entry['issue'] for c, entry in pending])
+    for (c, entry), issue in zip(pending, issues):
+        if entry['issue'] and entry['issue'] not in resolver.bodies:
+            continue
+        with metrics.phase('parse'):
+            entry['prompts'] = extract_example_prompts(body_of(issue))
+        if entry['issue']:
+            entry['updated'][entry['issue']] = updated_at(issue)
+
+    fallback = [(c, entry) for c, entry in pending
+                if entry['prompts'] == [] and not (entry['pr'] and entry['pr'] == entry['issue'])]
+    resolver.prs([c for c, entry in fallback if not entry['pr']])
+    resolver.issues([entry['pr'] for c, entry in fallback if entry['pr']])
+    for c, entry in fallback:
+        if not resolver.looked_up(c, entry['pr']):
+            entry['prompts'] = None
+            continue
+        pr = resolver.bodies.get(entry['pr']) if entry['pr'] else resolver.commit_prs.get(c['sha'])
+        with metrics.phase('parse'):
+            entry['prompts'] = extract_example_prompts(body_of(pr))
+        if pr:
+            entry['updated'][entry['pr'] or str(pr.get('number'))] = updated_at(pr)
+
+def peek_commits(commits, n):
+    """Read the stream until n feature commits are seen.
+
+    Returns (peeked, stream): the commits read so far, and an iterator that
+    yields them again followed by the rest of the stream.
+    """
+    peeked = []
+    features = 0
+    for c in commits:
+        peeked.append(c)
+        features += not is_noise(c['subject'])
+        if features >= n:
+            break
+    return peeked, itertools.chain(peeked, commits)
+
+def input_fingerprint(version, commits):
+    """Hash of everything the feature list is built from that git alone can tell.
+
+    Covers the newest FINGERPRINT_WINDOW feature commits — far more than can
+    be rendered even after dedupe. If it matches the last post, only issue/PR
+    edits could change the message.
+    """
+    feature_shas = [c['sha'] for c in commits if not is_noise(c['subject'])][:FINGERPRINT_WINDOW]
+    return hashlib.sha256('\n'.join([version] + feature_shas).encode()).hexdigest()[:16]
+
+def collect_status(commits, version, budget=None, index=None, resolver=None):
+    """Resolve the feature list; `index` is a CommitIndex kept across calls, or None to load one.
+
+    With a shared `resolver` (batch mode) the caller also owns the index:
+    refreshing it before and saving it after all targets of its repository.
+    """
+    if resolver:
+        return Status(version, resolve_features(commits, resolver, index, budget))
+    index = index or CommitIndex()
+    index.refresh()
+    with ThreadPoolExecutor(max_workers=RESOLVE_WORKERS) as pool:
+        features = resolve_features(commits, Resolver(pool), index, budget)
+    index.save()
+    return Status(version, features)
@@ -0,0 +1,102 @@
+"""
+Latency budget for the lookups of one status update.
+
+With DEV_STATUS_DEADLINE=<seconds>, resolving a status (commit list, PRs,
+issues, prompts) gets that long; posting the result is not counted. Inside
+the window every lookup (GET or GraphQL query) gets a timeout no longer
+than the time left, transient failures are retried with jittered backoff
+while time remains, and a lookup that takes much longer than its endpoint
+usually needs is hedged with a second copy — whichever answers first is
+used. Once the budget is spent, lookups fail at once and the status is
+rendered from what was resolved by then: features whose issue or prompts
+didn't arrive go out with their title only, and are resolved again by the
+next run. The commit list itself is not degraded: if it can't be read in
+full, the update stops and the existing message stays (source.SourceUnavailable).
+
+Outside a window (changelog mode, or DEV_STATUS_DEADLINE unset) requests
+keep the transport's fixed timeout and are never hedged.
+"""
+
+import os, time, random, statistics, threading
+from collections import deque
+from contextlib import contextmanager
+
+DEADLINE     = float(os.environ.get('DEV_STATUS_DEADLINE') or 0)   # seconds; 0 = no limit
+MIN_TIMEOUT  = 0.5      # don't start a request with less time than this left
+BACKOFF      = 0.25     # first retry waits up to this long, doubling per retry (full jitter)
+BACKOFF_MAX  = 4.0
+HEDGE_FIRST  = 1.0      # hedge delay before an endpoint's latency is known
+HEDGE_MIN    = 0.3
+HEDGE_FACTOR = 3        # hedge a lookup still running after this many times its endpoint's median latency
+HEDGE_SHARE  = 0.1      # at most one hedged copy per ten requests (plus one), to spare the rate limit
+SAMPLES      = 50       # recent latencies kept per endpoint
+
+stats = {'lookups': 0, 'retries': 0, 'hedged': 0, 'hedge_wins': 0, 'skipped': 0}   # lookups: sent inside windows
+
+_lock = threading.Lock()
+_ends = None            # time.monotonic() at which the open window closes
+_open = 0               # windows currently open; concurrent ones (batch targets) share the first
+_latency = {}           # (host, endpoint) → deque of recent latencies
+
+@contextmanager
+def window(seconds=DEADLINE):
+    """Bound the lookups made until the block exits, in any thread, to `seconds`."""
+    global _ends, _open
+    if not seconds:
+        yield
+        return
+    with _lock:
+        if not _open:
+            _ends = time.monotonic() + seconds
+        _open += 1
+    try:
+        yield
+    finally:
+        with _lock:
+            _open -= 1
+            if not _open:
+                _ends = None
+
+def active():
+    return _ends is not None
+
+def remaining():
+    ends = _ends
+    return float('inf') if ends is None else ends - time.monotonic()
+
+def expired():
+    return remaining() < MIN_TIMEOUT
+
+def backoff(attempt):
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF * 2 ** attempt))
+
+def observe(route, seconds):
+    with _lock:
+        _latency.setdefault(route, deque(maxlen=SAMPLES)).append(seconds)
+
+def hedge_delay(route):
+    """Seconds to wait for a lookup on `route` (ratelimit.route_of) before sending a second copy."""
+    with _lock:
+        samples = list(_latency.get(route) or ())
+    if not samples:
+        return HEDGE_FIRST
+    return max(HEDGE_MIN, HEDGE_FACTOR * statistics.median(samples))
+
+def may_hedge():
+    """Claim one hedge if HEDGE_SHARE allows it."""
+    with _lock:
+        if stats['hedged'] >= HEDGE_SHARE * stats['lookups'] + 1:
+            return False
+        stats['hedged'] += 1
+        return True
+
+def note(key, n=1):
+    with _lock:
+        stats[key] += n
+
+def summary():
+    """One line on what the budget did this run, or None if it never came into play."""
+    if not (stats['retries'] or stats['hedged'] or stats['skipped']):
+        return None
+    return (f"{stats['retries']} after transient failures, {stats['hedged']} hedged ({stats['hedge_wins']} won), "
+            f"{stats['skipped']} lookups skipped at the deadline")
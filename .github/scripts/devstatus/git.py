@@ -0,0 +1,177 @@
+"""Local repository reads.
+
+Objects (commit messages, files at a commit, what a rev points at) are read
+through one long-lived `git cat-file --batch` process per clone (Session)
+instead of a git process per read; history walks stream `git rev-list` into
+it. Only tag listing, fetching and the shallow check still run git per call.
+"""
+
+import re, atexit, itertools, threading, subprocess
+from functools import lru_cache
+
+DEFAULT_BRANCH = "main"
+READ_AHEAD     = 256      # shas written to cat-file per round trip; their input stays well under a pipe buffer
+
+VERSION_RE = re.compile(r'<version>([^<]+)</version>', re.IGNORECASE)
+RELEASE_RE = re.compile(r'(\d+\.\d+\.\d+)')
+
+# ── Object reads ────────────────────────────────────────────────────────────
+
+class Session:
+    """One `git cat-file --batch` process, shared by every thread reading the same clone."""
+
+    def __init__(self, cwd=None):
+        self.cwd = cwd
+        self.lock = threading.Lock()
+        self.proc = None
+
+    def start(self):
+        self.proc = subprocess.Popen(['git', 'cat-file', '--batch'], stdin=subprocess.PIPE,
+                                     stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, cwd=self.cwd)
+
+    def read_many(self, names):
+        """[(sha, type, data) or None] for object names ('HEAD', 'v1.2^{commit}', 'sha:path')."""
+        with self.lock:
+            try:
+                if self.proc is None or self.proc.poll() is not None:
+                    self.start()
+                self.proc.stdin.write(''.join(f'{n}\n' for n in names).encode())
+                self.proc.stdin.flush()
+                return [self._read_one() for _ in names]
+            except (OSError, ValueError) as e:
+                print(f"  git cat-file failed: {e}")
+                self.close()
+                return [None] * len(names)
+
+    def _read_one(self):
+        header = self.proc.stdout.readline().split()
+        if len(header) != 3:               # "<name> missing" / "<name> ambiguous"
+            if not header:
+                raise OSError('cat-file exited')
+            return None
+        sha, kind, size = header
+        data = self.proc.stdout.read(int(size) + 1)[:-1]     # each object ends with a newline
+        return sha.decode(), kind.decode(), data
+
+    def read(self, name):
+        return self.read_many([name])[0] if name and '\n' not in name else None
+
+    def close(self):
+        if self.proc:
+            if self.proc.poll() is None:
+                self.proc.kill()
+            self.proc.wait()
+            self.proc = None
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def session(cwd=None):
+    """The Session for a clone, started on first use and kept for the rest of the run."""
+    with _sessions_lock:
+        if cwd not in _sessions:
+            _sessions[cwd] = Session(cwd)
+        return _sessions[cwd]
+
+@atexit.register
+def close_sessions():
+    with _sessions_lock:
+        for s in _sessions.values():
+            s.close()
+        _sessions.clear()
+
+def parse_commit(sha, data):
+    """{'sha', 'subject', 'body'} of a raw commit object."""
+    _, _, message = data.decode('utf-8', 'replace').partition('\n\n')    # headers end at the first blank line
+    subject, body = split_message(message)
+    return {'sha': sha, 'subject': subject, 'body': body}
+
+# ── History ─────────────────────────────────────────────────────────────────
+
+def iter_unreleased_commits(head='HEAD', base=DEFAULT_BRANCH, cwd=None):
+    """Yield origin/<base>..head commits (subject and full body) newest first.
+
+    Streams rev-list's output and kills it as soon as the consumer stops
+    iterating, so a long-lived branch is only walked as far as needed.
+    """
+    return iter_commits([f'origin/{base}..{head}'], cwd)
+
+def iter_commits(revs, cwd=None):
+    """Yield the commits git rev-list lists for `revs` (e.g. ['v1.2..v1.3']), newest first."""
+    proc = subprocess.Popen(['git', 'rev-list', *revs], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                            text=True, cwd=cwd)
+    try:
+        shas = (line.strip() for line in proc.stdout)
+        while (chunk := list(itertools.islice(shas, READ_AHEAD))):
+            for sha, obj in zip(chunk, session(cwd).read_many(chunk)):
+                if obj and obj[1] == 'commit':
+                    yield parse_commit(sha, obj[2])
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+        proc.stdout.close()
+        proc.wait()
+
+def split_message(message):
+    """(subject, body) of a raw commit message, split the way %s / %b do."""
+    head, _, body = message.strip('\n').partition('\n\n')
+    return ' '.join(head.split('\n')).strip(), body.strip()
+
+def head_sha(rev='HEAD', cwd=None):
+    """The commit `rev` points at, or '' if it doesn't resolve."""
+    obj = session(cwd).read(f'{rev}^{{commit}}') if rev else None
+    return obj[0] if obj else ''
+
+@lru_cache(maxsize=None)
+def is_shallow(cwd=None):
+    result = subprocess.run(['git', 'rev-parse', '--is-shallow-repository'],
+                            capture_output=True, text=True, cwd=cwd)
+    return result.stdout.strip() == 'true'
+
+def parse_version(about_xml):
+    m = VERSION_RE.search(about_xml or '')
+    return m.group(1).strip() if m else None
+
+def version_from_subjects(subjects):
+    m = RELEASE_RE.search('\n'.join(subjects))
+    return m.group(1) if m else ''
+
+def show_file(rev, path, cwd=None):
+    obj = session(cwd).read(f'{rev}:{path}')
+    return obj[2].decode('utf-8', 'replace') if obj and obj[1] == 'blob' else None
+
+def get_version(head='HEAD', cwd=None):
+    """Read version from About/About.xml on `head`."""
+    sha = head_sha(head, cwd)
+    return version_at(sha, cwd) if sha else ''
+
+@lru_cache(maxsize=256)
+def version_at(sha, cwd=None):
+    """Version at a commit; cached, since batch targets often share their head."""
+    version = parse_version(show_file(sha, 'About/About.xml', cwd))
+    if version:
+        return version
+    # Fallback: scan recent commit messages
+    return version_from_subjects([c['subject'] for c in itertools.islice(iter_commits([sha], cwd), 5)])
+
+def release_tags(to='HEAD', cwd=None):
+    """[(tag, sha, date)] of the tags reachable from `to`, oldest first (in history order,
+    not by tag date, which can't order tags created in the same second)."""
+    result = subprocess.run(['git', 'log', '--topo-order', '--simplify-by-decoration', '--decorate-refs=refs/tags/',
+                             '--format=%H%x1f%D%x1f%cs', to],
+                            capture_output=True, text=True, cwd=cwd)
+    tags = []
+    for line in result.stdout.splitlines():
+        sha, refs, date = line.split('\x1f')
+        names = [r[len('tag: '):] for r in refs.split(', ') if r.startswith('tag: ')]
+        if names:
+            tags.append((names[0], sha, date))
+    return tags[::-1]
+
+def fetch(cwd=None):
+    """Bring origin/* up to date (server mode keeps a long-lived clone)."""
+    result = subprocess.run(['git', 'fetch', '--quiet', '--prune', 'origin'], capture_output=True, text=True,
+                            cwd=cwd)
+    if result.returncode:
+        print(f"  git fetch failed: {result.stderr.strip()}")
+    return result.returncode == 0
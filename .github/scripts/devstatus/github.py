@@ -0,0 +1,238 @@
+"""GitHub REST/GraphQL helpers used to resolve commits to PRs and issues."""
+
+import os, base64
+
+from . import cache, deadline, metrics, transport
+from .transport import HTTPError, DeadlineExceeded
+
+GH_TOKEN    = os.environ.get('GH_TOKEN', '')
+REPO        = "Bwarhness/RimMind"
+API_URL     = os.environ.get('GITHUB_API_URL', 'https://api.github.com')
+GRAPHQL_URL = os.environ.get('GITHUB_GRAPHQL_URL', 'https://api.github.com/graphql')
+BACKEND     = os.environ.get('DEV_STATUS_BACKEND', 'rest')  # 'rest' or 'graphql'
+
+# Lookups that got no answer (network error, 5xx, deadline) return this
+# instead of None, which means GitHub answered that there is nothing: the
+# caller can leave the question open for a later run instead of remembering
+# the absence.
+UNAVAILABLE = object()
+ABSENT = {404, 410, 422}   # statuses that answer "no such object"
+
+# ── REST ────────────────────────────────────────────────────────────────────
+
+HEADERS = {
+    'Accept': 'application/vnd.github+json',
+    'X-GitHub-Api-Version': '2022-11-28'
+}
+
+def gh_headers():
+    return {'Authorization': f'Bearer {GH_TOKEN}', **HEADERS}
+
+def gh_get(path, repo=REPO, failed=None):
+    """Parsed JSON of a GET (revalidated against the cache); None if absent, `failed` if unanswered."""
+    url = f"{API_URL}/repos/{repo}/{path}"
+    headers = gh_headers()
+    cached = cache.load(url)
+    if cached:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+    try:
+        r = transport.request('GET', url, headers=headers)
+    except DeadlineExceeded:
+        return failed
+    except HTTPError as e:
+        print(f"  gh_get {path} failed: {e}")
+        return None if e.status in ABSENT else failed
+    if r.status == 304 and cached:
+        cache.touch(url)
+        cache.count('hit')
+        return cached['data']
+    try:
+        data = r.json()
+    except ValueError as e:
+        print(f"  gh_get {path} failed: {e}")
+        return failed
+    cache.store(url, r.headers, data)
+    cache.count('miss')
+    return data
+
+def gh_list_variables(repo=REPO):
+    """{name: value} of every Actions variable of `repo`, or None if they can't be listed."""
+    variables = {}
+    page = 1
+    with metrics.phase('variables'):
+        while True:
+            try:
+                data = transport.request('GET', f"{API_URL}/repos/{repo}/actions/variables?per_page=30&page={page}",
+                                         headers=gh_headers()).json()
+            except (HTTPError, ValueError) as e:
+                print(f"  gh_list_variables {repo} failed: {e}")
+                return None
+            items = data.get('variables') or []
+            variables.update((v['name'], v['value']) for v in items)
+            if len(items) < 30 or len(variables) >= data.get('total_count', 0):
+                return variables
+            page += 1
+
+def gh_set_variable(name, value, repo=REPO):
+    with metrics.phase('variables'):
+        return _set_variable(name, value, repo)
+
+def _set_variable(name, value, repo):
+    url = f"{API_URL}/repos/{repo}/actions/variables/{name}"
+    payload = {'name': name, 'value': value}
+    for method in ('PATCH', 'POST'):
+        endpoint = url if method == 'PATCH' else f"{API_URL}/repos/{repo}/actions/variables"
+        try:
+            transport.request(method, endpoint, body=payload, headers=gh_headers())
+            return True
+        except HTTPError as e:
+            if e.status == 404 and method == 'PATCH':
+                continue
+            print(f"  gh_set_variable {name} ({method}) failed: {e}")
+            return False
+
+def get_pr_for_commit(sha, repo=REPO):
+    data = gh_get(f"commits/{sha}/pulls", repo, UNAVAILABLE)
+    if data is UNAVAILABLE:
+        return data
+    if data:
+        return data[0]
+    return None
+
+def get_issue(number, repo=REPO):
+    return gh_get(f"issues/{number}", repo, UNAVAILABLE)
+
+def get_updated_since(since, repo=REPO):
+    """{number: updated_at} for every issue and PR updated at or after `since`.
+
+    Returns None if any page fails, since a partial answer can't prove freshness.
+    """
+    updated = {}
+    page = 1
+    while True:
+        items = gh_get(f"issues?state=all&since={since}&per_page=100&page={page}", repo)
+        if items is None:
+            return None
+        for item in items:
+            updated[str(item['number'])] = item.get('updated_at')
+        if len(items) < 100:
+            return updated
+        page += 1
+
+def iter_compare_commits(base, head, repo=REPO):
+    """Commits in base...head newest first, like git log, or None if the API fails.
+
+    The compare API pages oldest first, so after the first page (which gives
+    the total) pages are fetched last to first and only as far as consumed.
+    A later page that fails raises HTTPError from the iterator: the list
+    can't be cut short without hiding the commits it would have held.
+    """
+    def page(n):
+        return gh_get(f"compare/{base}...{head}?per_page=100&page={n}", repo)
+
+    first = page(1)
+    if first is None:
+        return None
+    pages = max(1, -(-first.get('total_commits', 0) // 100))
+
+    def walk():
+        for n in range(pages, 0, -1):
+            data = first if n == 1 else page(n)
+            if data is None:
+                raise HTTPError(None, f"compare page {n} of {pages} failed")
+            yield from reversed(data.get('commits') or [])
+    return walk()
+
+def get_file_text(path, ref, repo=REPO):
+    data = gh_get(f"contents/{path}?ref={ref}", repo)
+    if not data or data.get('encoding') != 'base64':
+        return None
+    return base64.b64decode(data['content']).decode('utf-8', 'replace')
+
+# ── GraphQL ─────────────────────────────────────────────────────────────────
+# One aliased query per chunk instead of one REST call per commit/issue.
+# 100 single-node connections per query keeps each query at the minimum
+# rate-limit cost of 1 point.
+
+GRAPHQL_CHUNK = 100
+
+def gh_graphql(query):
+    try:
+        result = transport.request('POST', GRAPHQL_URL, body={'query': query}, idempotent=True,
+                                   headers={'Authorization': f'Bearer {GH_TOKEN}'}).json()
+    except DeadlineExceeded:
+        return None
+    except (HTTPError, ValueError) as e:
+        print(f"  gh_graphql failed: {e}")
+        return None
+    for err in result.get('errors') or []:
+        print(f"  gh_graphql error: {err.get('message')}")
+    return result.get('data')
+
+def rest_shape(node):
+    """GraphQL node → the subset of the REST issue/PR shape the pipeline reads."""
+    if not node:
+        return None
+    return {'number': node.get('number'), 'body': node.get('body'), 'updated_at': node.get('updatedAt')}
+
+def graphql_repo_query(fields, repo=REPO):
+    owner, name = repo.split('/')
+    return f'query {{ repository(owner: "{owner}", name: "{name}") {{ {" ".join(fields)} }} }}'
+
+def get_prs_graphql(shas, repo=REPO):
+    prs = []
+    for i in range(0, len(shas), GRAPHQL_CHUNK):
+        chunk = shas[i:i + GRAPHQL_CHUNK]
+        data = gh_graphql(graphql_repo_query((
+            f'c{n}: object(oid: "{sha}") {{ ... on Commit {{ '
+            f'associatedPullRequests(first: 1) {{ nodes {{ number body updatedAt }} }} }} }}'
+            for n, sha in enumerate(chunk)), repo))
+        if data is None:
+            return None
+        found = data.get('repository') or {}
+        for n in range(len(chunk)):
+            nodes = ((found.get(f'c{n}') or {}).get('associatedPullRequests') or {}).get('nodes')
+            prs.append(rest_shape(nodes[0]) if nodes else None)
+    return prs
+
+def get_issues_graphql(numbers, repo=REPO):
+    issues = []
+    for i in range(0, len(numbers), GRAPHQL_CHUNK):
+        chunk = numbers[i:i + GRAPHQL_CHUNK]
+        # issueOrPullRequest mirrors REST issues/{n}, which also answers for PR numbers
+        data = gh_graphql(graphql_repo_query((
+            f'i{n}: issueOrPullRequest(number: {num}) {{ '
+            f'... on Issue {{ number body updatedAt }} ... on PullRequest {{ number body updatedAt }} }}'
+            for n, num in enumerate(chunk)), repo))
+        if data is None:
+            return None
+        found = data.get('repository') or {}
+        issues.extend(rest_shape(found.get(f'i{n}')) for n in range(len(chunk)))
+    return issues
+
+# ── Backend dispatch ────────────────────────────────────────────────────────
+
+def fetch_prs(commits, pool, repo=REPO):
+    """Associated PR (or None) per commit; UNAVAILABLE where the lookup failed."""
+    if BACKEND == 'graphql':
+        prs = get_prs_graphql([c['sha'] for c in commits], repo)
+        if prs is not None:
+            return prs
+        if deadline.expired():
+            return [UNAVAILABLE] * len(commits)
+    return list(pool.map(lambda c: get_pr_for_commit(c['sha'], repo), commits))
+
+def fetch_issues(numbers, pool, repo=REPO):
+    """Issue/PR (or None) per number; UNAVAILABLE where the lookup failed."""
+    if BACKEND == 'graphql':
+        wanted = [n for n in numbers if n]
+        issues = get_issues_graphql(wanted, repo) if wanted else []
+        if issues is not None:
+            found = iter(issues)
+            return [next(found) if n else None for n in numbers]
+        if deadline.expired():
+            return [UNAVAILABLE if n else None for n in numbers]
+    return list(pool.map(lambda n: get_issue(n, repo) if n else None, numbers))
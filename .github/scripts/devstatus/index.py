@@ -0,0 +1,95 @@
+"""
+Persistent per-commit index so a run only resolves commits it hasn't seen.
+
+Stored as JSON next to the response cache (and restored with it between
+workflow runs). Each entry records what the pipeline worked out for one
+commit: noise classification, PR/issue numbers, display title, extracted
+prompts and the updated_at of every issue/PR whose body was used. An entry
+is dropped when one of those issues/PRs has been edited since it was written,
+which one `issues?since=` listing per run detects.
+"""
+
+import os, json, time
+from datetime import datetime, timezone
+
+from . import cache, github
+from .content import rules_digest
+
+INDEX_VERSION = 1
+INDEX_PATH    = os.path.join(cache.CACHE_DIR, 'commit-index.json')
+INDEX_MAX_AGE = 30 * 24 * 3600   # forget commits not seen for 30 days
+
+stats = {'reused': 0, 'resolved': 0, 'invalidated': 0}
+
+def path_for(repo):
+    """Index file for `repo`: PR/issue numbers only mean something within one repository."""
+    if repo == github.REPO:
+        return INDEX_PATH
+    return os.path.join(cache.CACHE_DIR, f"commit-index-{repo.replace('/', '-')}.json")
+
+def utc_now_iso():
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+class CommitIndex:
+    def __init__(self, path=INDEX_PATH, repo=github.REPO):
+        self.path = path
+        self.repo = repo
+        self.entries = {}
+        self.synced_at = None
+        self.started_at = utc_now_iso()
+        self.now = time.time()
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        # Entries computed under different classification rules are meaningless
+        if data.get('version') == INDEX_VERSION and data.get('rules') == rules_digest():
+            self.entries = data.get('entries', {})
+            self.synced_at = data.get('synced_at')
+
+    def refresh(self):
+        """Drop entries whose linked issue/PR changed since the last run."""
+        # A long-lived index (server mode) refreshes once per update
+        self.started_at = utc_now_iso()
+        self.now = time.time()
+        if not self.entries or not self.synced_at:
+            return
+        updated = github.get_updated_since(self.synced_at, self.repo)
+        if updated is None:
+            # Can't tell what changed. Re-resolving everything would need the
+            # API that just failed, so keep the entries for this run and leave
+            # synced_at where it was: the next refresh covers this run too.
+            print("  index refresh failed — reusing entries as they are")
+            self.started_at = self.synced_at
+            return
+        stale = [sha for sha, e in self.entries.items()
+                 if any(n in updated and updated[n] != ts for n, ts in e.get('updated', {}).items())]
+        for sha in stale:
+            del self.entries[sha]
+        stats['invalidated'] += len(stale)
+
+    def get(self, sha):
+        entry = self.entries.get(sha)
+        if entry:
+            entry['seen'] = self.now
+        return entry
+
+    def put(self, sha, **fields):
+        entry = self.entries.setdefault(sha, {})
+        entry.update(fields, seen=self.now)
+        return entry
+
+    def save(self):
+        entries = {sha: e for sha, e in self.entries.items()
+                   if self.now - e.get('seen', 0) <= INDEX_MAX_AGE}
+        tmp = self.path + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(tmp, 'w') as f:
+                json.dump({'version': INDEX_VERSION, 'rules': rules_digest(),
+                           'synced_at': self.started_at, 'entries': entries}, f)
+            os.replace(tmp, self.path)
+            self.synced_at = self.started_at
+        except OSError as e:
+            print(f"  index write {self.path} failed: {e}")
@@ -0,0 +1,148 @@
+"""
+Latest-wins coordination between overlapping runs for the same message.
+
+Every push starts a run, and runs for dev and main (and manual dispatches)
+all edit the same messages. Without coordination a slow, older run can post
+after a newer one, and two runs that both find no message ID each post one.
+
+A run claims a lease ("<run id>:<head sha>:<expires>") in a variable before
+doing any work, and checks it again right before posting. Run IDs only grow,
+so whichever run started last owns the lease, and an older run that sees a
+newer claim exits without finishing its lookups or touching the messages.
+Before posting, the run also asks GitHub whether its branch has moved past
+the commit it was started for. If the new commits will start a run of their
+own (anything but [skip ci] pushes and version bumps), that run takes over.
+
+DEV_STATUS_LEASE picks the store: 'variable' (Actions variables of the
+repository the sinks keep their message IDs in, as the workflow uses),
+'file' (a JSON file in the cache directory, for runners that share a disk),
+or 'off' (default).
+"""
+
+import os, re, json, time, fcntl
+
+from . import cache, git, github
+from .targets import variable_suffix
+
+LEASE_MODE = os.environ.get('DEV_STATUS_LEASE', 'off')   # off | variable | file
+LEASE_VAR  = 'DEV_STATUS_LEASE'
+LEASE_TTL  = 15 * 60          # a claim older than this belongs to a run that died
+RUN_ID     = int(os.environ.get('GITHUB_RUN_ID') or time.time_ns())
+
+IGNORED_PATHS = {'About/About.xml'}   # version bumps alone don't start a run (workflow paths-ignore)
+SKIP_CI = re.compile(r'\[(?:skip ci|ci skip|no ci|skip actions|actions skip)\]', re.IGNORECASE)
+
+def parse(value):
+    """(run id, sha, expires) of a stored claim, or None."""
+    try:
+        run_id, sha, expires = (value or '').split(':')
+        return int(run_id), sha, float(expires)
+    except ValueError:
+        return None
+
+def starts_run(compare):
+    """True if the commits in a compare response will trigger another status run."""
+    commits = compare.get('commits') or []
+    if all(SKIP_CI.search(c['commit']['message']) for c in commits):
+        return False
+    files = {f['filename'] for f in compare.get('files') or []}
+    return not files or bool(files - IGNORED_PATHS)
+
+class VariableStore:
+    """Actions variables; reading lists them all, so message IDs come along for free."""
+
+    def __init__(self, repo):
+        self.repo = repo
+
+    def read(self):
+        return github.gh_list_variables(self.repo)
+
+    def write(self, name, value):
+        return github.gh_set_variable(name, value, self.repo)
+
+class FileStore:
+    def __init__(self, path=None):
+        self.path = path or os.path.join(cache.CACHE_DIR, 'leases.json')
+
+    def read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def write(self, name, value):
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path + '.lock', 'w') as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                values = self.read()
+                values[name] = value
+                with open(self.path + '.tmp', 'w') as f:
+                    json.dump(values, f)
+                os.replace(self.path + '.tmp', self.path)
+            return True
+        except OSError as e:
+            print(f"  lease write {self.path} failed: {e}")
+            return False
+
+class Lease:
+    def __init__(self, target, store, name=LEASE_VAR, run_id=RUN_ID):
+        self.target = target
+        self.store = store
+        self.repo = getattr(store, 'repo', None)   # whose variables the store lists, if any
+        self.name = name
+        self.run_id = run_id
+        self.sha = git.head_sha(target.head, target.path)
+        self.variables = None    # latest variable listing, when the store is the variables
+
+    def owner(self, values):
+        """The newer run holding the lease, if any."""
+        claim = parse((values or {}).get(self.name))
+        if claim and claim[0] > self.run_id and claim[2] > time.time():
+            return claim
+        return None
+
+    def read(self):
+        values = self.store.read()
+        if isinstance(self.store, VariableStore):
+            self.variables = values
+        return values
+
+    def claim(self, values=None):
+        """Take the lease unless a newer run holds it; returns a reason to stop, or None."""
+        values = self.read() if values is None else values
+        if (newer := self.owner(values)):
+            return f"run {newer[0]} (for {newer[1][:12]}) is newer"
+        # Can't write → carry on uncoordinated rather than skip the update
+        self.store.write(self.name, f"{self.run_id}:{self.sha}:{int(time.time() + LEASE_TTL)}")
+        return None
+
+    def superseded(self):
+        """Right before posting: a reason to stop, or None to go ahead."""
+        if (newer := self.owner(self.read())):
+            return f"run {newer[0]} (for {newer[1][:12]}) took over"
+        if not self.sha:
+            return None
+        compare = github.gh_get(f"compare/{self.sha}...{self.target.branch}", self.target.repo)
+        if compare and compare.get('ahead_by') and starts_run(compare):
+            return f"{self.target.branch} moved on by {compare['ahead_by']} commits with their own run"
+        return None
+
+def for_target(target, mode=LEASE_MODE):
+    """The lease for `target`'s messages, or None when coordination is off.
+
+    With the variable store the lease lives next to the message IDs, so the
+    check before posting also refreshes them. Raises ValueError if the
+    target's sinks keep their IDs in more than one repository.
+    """
+    name = LEASE_VAR if target.name == 'dev' else f"{LEASE_VAR}_{variable_suffix(target.name)}"
+    if mode == 'variable':
+        repos = {s.repo for s in target.sinks} or {target.repo}
+        if len(repos) > 1:
+            raise ValueError(f"sinks of {target.name} keep their message IDs in {', '.join(sorted(repos))}; "
+                             f"a lease needs them in one repository")
+        return Lease(target, VariableStore(repos.pop()), name)
+    if mode == 'file':
+        return Lease(target, FileStore(), name)
+    return None
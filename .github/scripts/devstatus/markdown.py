@@ -0,0 +1,57 @@
+"""
+Single-pass section index for PR/issue bodies.
+
+A body is split into lines once and its headings recorded; any section's
+cleaned bullet lines can then be read without rescanning the body. Indexes
+are memoized per body, so the same text (an issue that is also the PR, or a
+body seen by several callers) is only parsed once per run.
+"""
+
+import re
+from functools import lru_cache
+
+_LEADING = re.compile(r'[-*>\s]+')                # bullets, quote markers, indentation
+_MARKUP  = str.maketrans('', '', '*_`')
+
+def clean_line(line):
+    """Strip bullets, markdown emphasis, "— annotation" suffixes and quotes."""
+    m = _LEADING.match(line)
+    line = (line[m.end():] if m else line).strip().translate(_MARKUP)
+    if '—' in line:
+        line = line.partition('—')[0].rstrip()
+    return line.strip('"\'').strip()
+
+class SectionIndex:
+    def __init__(self, body):
+        self.lines = body.split('\n')
+        self.headings = []   # (title, first content line, end line)
+        open_sections = []
+        for i, line in enumerate(self.lines):
+            if not line.lstrip().startswith('##'):
+                continue
+            # Only a level-2 heading ("## ", at column 0) closes the sections above it
+            if line.startswith('##') and (len(line) == 2 or line[2].isspace()):
+                for s in open_sections:
+                    self.headings[s][2] = i
+                open_sections = []
+            # "## Title", "### Title", …; string methods, as a regex backtracks on long blank runs
+            open_sections.append(len(self.headings))
+            self.headings.append([line.strip().lstrip('#').strip(), i + 1, len(self.lines)])
+
+    def section(self, title):
+        """Raw lines of the first section whose heading fully matches `title` (a compiled regex)."""
+        for heading, start, end in self.headings:
+            if title.fullmatch(heading):
+                return self.lines[start:end]
+        return None
+
+    def bullets(self, title):
+        """Cleaned, non-empty lines of a section, produced lazily."""
+        for line in self.section(title) or ():
+            line = clean_line(line)
+            if line:
+                yield line
+
+@lru_cache(maxsize=256)
+def index_for(body):
+    return SectionIndex(body)
@@ -0,0 +1,130 @@
+"""
+Run measurements: phase timings and every outbound HTTP request.
+
+Phases are timed with `with metrics.phase('resolve'): ...`. A phase entered
+inside another one is subtracted from its parent, so each phase reports its
+own time (git, resolve, parse, render, post, variables); phases running in
+worker threads add up across threads. The transport records each request
+attempt with host, endpoint, status, latency, bytes and cache outcome.
+
+At the end of the run the report goes to the JSON file named by
+DEV_STATUS_METRICS and, as Markdown tables, to $GITHUB_STEP_SUMMARY. With
+DEV_STATUS_PROFILE set, the main thread also runs under cProfile and the
+stats are dumped to that path (open with `python -m pstats`).
+"""
+
+import os, re, json, time, cProfile, threading
+from contextlib import contextmanager
+
+METRICS_PATH = os.environ.get('DEV_STATUS_METRICS')
+SUMMARY_PATH = os.environ.get('GITHUB_STEP_SUMMARY')
+PROFILE_PATH = os.environ.get('DEV_STATUS_PROFILE')
+
+phases = {}          # phase name → seconds spent in it (excluding nested phases)
+requests = []        # one dict per HTTP attempt, in completion order
+counters = {}        # run-level counts filled in by the script (cache hits, commits read, …)
+_lock = threading.Lock()
+_local = threading.local()
+_started = time.perf_counter()
+
+# Bot tokens are part of Telegram's URL path; never let them into a report
+_TOKEN = re.compile(r'/bot[^/]+')
+
+def reset():
+    """Start a new measurement (server mode reports each update separately)."""
+    global _started
+    with _lock:
+        phases.clear()
+        requests.clear()
+        counters.clear()
+        _started = time.perf_counter()
+
+@contextmanager
+def phase(name):
+    stack = _local.__dict__.setdefault('stack', [])
+    frame = [name, 0.0]      # name, time spent in nested phases
+    stack.append(frame)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stack.pop()
+        if stack:
+            stack[-1][1] += elapsed
+        with _lock:
+            phases[name] = phases.get(name, 0.0) + elapsed - frame[1]
+
+def record_request(host, endpoint, status, seconds, sent, received, cache=None):
+    """One request attempt; `status` is None when no response came back."""
+    with _lock:
+        requests.append({'host': host, 'endpoint': _TOKEN.sub('/bot<token>', endpoint), 'status': status,
+                         'ms': round(seconds * 1000, 1), 'sent': sent, 'received': received,
+                         'cache': cache})
+
+def endpoints():
+    """Requests aggregated per (host, endpoint), busiest first."""
+    agg = {}
+    with _lock:
+        for r in requests:
+            e = agg.setdefault((r['host'], r['endpoint']), {
+                'host': r['host'], 'endpoint': r['endpoint'], 'calls': 0, 'errors': 0,
+                'cache_hits': 0, 'ms': 0.0, 'max_ms': 0.0, 'sent': 0, 'received': 0})
+            e['calls'] += 1
+            e['errors'] += not r['status'] or r['status'] >= 400
+            e['cache_hits'] += r['cache'] == 'hit'
+            e['ms'] = round(e['ms'] + r['ms'], 1)
+            e['max_ms'] = max(e['max_ms'], r['ms'])
+            e['sent'] += r['sent']
+            e['received'] += r['received']
+    return sorted(agg.values(), key=lambda e: (-e['ms'], e['endpoint']))
+
+def report():
+    with _lock:
+        result = {'total_s': round(time.perf_counter() - _started, 6),
+                  'phases_s': {name: round(t, 6) for name, t in phases.items()},
+                  'counters': dict(counters),
+                  'requests': list(requests)}
+    result['endpoints'] = endpoints()
+    return result
+
+def step_summary(data):
+    lines = [f"### Dev status run — {data['total_s']:.2f} s", '',
+             '| Phase | Time |', '| --- | ---: |']
+    lines += [f"| {name} | {t:.3f} s |" for name, t in sorted(data['phases_s'].items(), key=lambda p: -p[1])]
+    if data['endpoints']:
+        lines += ['', '| Host | Endpoint | Calls | Errors | Cache hits | Total | Max | Sent | Received |',
+                  '| --- | --- | ---: | ---: | ---: | ---: | ---: | ---: | ---: |']
+        lines += [f"| {e['host']} | `{e['endpoint']}` | {e['calls']} | {e['errors']} | {e['cache_hits']} | "
+                  f"{e['ms']:.0f} ms | {e['max_ms']:.0f} ms | {e['sent']} B | {e['received']} B |"
+                  for e in data['endpoints']]
+    if data['counters']:
+        lines += ['', ', '.join(f"{k}: {json.dumps(v)}" for k, v in data['counters'].items())]
+    return '\n'.join(lines) + '\n'
+
+def write():
+    """Write the report to DEV_STATUS_METRICS and $GITHUB_STEP_SUMMARY (whichever are set)."""
+    data = report()
+    if METRICS_PATH:
+        try:
+            with open(METRICS_PATH, 'w') as f:
+                json.dump(data, f, indent=2)
+        except OSError as e:
+            print(f"Could not write metrics to {METRICS_PATH}: {e}")
+    if SUMMARY_PATH:
+        try:
+            with open(SUMMARY_PATH, 'a') as f:
+                f.write(step_summary(data))
+        except OSError as e:
+            print(f"Could not write step summary: {e}")
+
+def profiled(fn):
+    """Call fn(), under cProfile when DEV_STATUS_PROFILE names an output file."""
+    if not PROFILE_PATH:
+        return fn()
+    profile = cProfile.Profile()
+    try:
+        return profile.runcall(fn)
+    finally:
+        profile.dump_stats(PROFILE_PATH)
+        print(f"Profile written to {PROFILE_PATH}")
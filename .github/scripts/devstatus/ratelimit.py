@@ -0,0 +1,129 @@
+"""
+Rate-limit bookkeeping under the transport.
+
+Bucket state is learned from response headers: GitHub's X-RateLimit-Resource
+/ -Remaining / -Reset (one bucket per resource: core, graphql, …) and
+Discord's per-route X-RateLimit-Bucket / -Remaining / -Reset-After. Before a
+request the scheduler waits out an exhausted bucket and spreads the last few
+requests of a nearly exhausted one over the time left until it resets.
+429s (and GitHub's rate-limit 403s) are retried after the server-specified
+delay — Retry-After, or Discord/Telegram's retry_after in the JSON body.
+"""
+
+import re, json, time, threading, urllib.parse
+
+MAX_WAIT  = 30      # never sleep longer than this for one request; let it fail instead
+RETRIES   = 3       # retries of one request after a 429 (or a transient failure, see transport)
+PACE_BELOW = 10     # start spacing requests out when a bucket has fewer left than this
+
+stats = {'waits': 0, 'waited': 0.0, 'retries': 0}
+
+_buckets = {}       # bucket key → {'limit', 'remaining', 'reset_at', 'next_at'}
+_routes = {}        # route → bucket key learned from responses
+_lock = threading.Lock()
+
+# Drop per-object IDs so e.g. every issues/{n} shares one route, but keep
+# Discord's major parameters (channel/guild/webhook), which select the bucket.
+_ID_SEGMENT = re.compile(r'(?<!channels)(?<!guilds)(?<!webhooks)/(?:\d+|[0-9a-f]{40})(?=/|$)')
+
+def route_of(method, url):
+    parts = urllib.parse.urlsplit(url)
+    return parts.netloc, f"{method} {_ID_SEGMENT.sub('/:id', parts.path)}"
+
+def _bucket_for(netloc, route):
+    key = _routes.get((netloc, route))
+    if key:
+        return key
+    # GitHub charges everything but GraphQL to the 'core' resource
+    return f"{netloc}:graphql" if route.endswith('/graphql') else f"{netloc}:core"
+
+def before(method, url):
+    """Block until the request's bucket has budget (or MAX_WAIT says give up waiting)."""
+    netloc, route = route_of(method, url)
+    with _lock:
+        b = _buckets.get(_bucket_for(netloc, route))
+        now = time.time()
+        if not b or b['reset_at'] <= now:
+            return
+        if b['remaining'] <= 0:
+            wait = b['reset_at'] - now
+        elif b['remaining'] < PACE_BELOW:
+            start = max(now, b['next_at'])
+            b['next_at'] = start + (b['reset_at'] - now) / b['remaining']
+            wait = start - now
+        else:
+            wait = 0
+        b['remaining'] -= 1
+    if 0 < wait <= MAX_WAIT:
+        with _lock:
+            stats['waits'] += 1
+            stats['waited'] += wait
+        time.sleep(wait)
+
+def has_room(method, url):
+    """True if the request's bucket is far from exhausted (an extra copy of it won't need pacing)."""
+    netloc, route = route_of(method, url)
+    with _lock:
+        b = _buckets.get(_bucket_for(netloc, route))
+        return not b or b['reset_at'] <= time.time() or b['remaining'] >= PACE_BELOW
+
+def after(method, url, headers):
+    """Record bucket state from a response's headers."""
+    netloc, route = route_of(method, url)
+    remaining = headers.get('X-RateLimit-Remaining')
+    if remaining is None:
+        return
+    if headers.get('X-RateLimit-Bucket'):
+        key = f"{netloc}:{headers['X-RateLimit-Bucket']}"
+    elif headers.get('X-RateLimit-Resource'):
+        key = f"{netloc}:{headers['X-RateLimit-Resource']}"
+    else:
+        key = _bucket_for(netloc, route)
+    now = time.time()
+    try:
+        if headers.get('X-RateLimit-Reset-After'):
+            reset_at = now + float(headers['X-RateLimit-Reset-After'])
+        else:
+            reset_at = float(headers.get('X-RateLimit-Reset') or now)
+        state = {'limit': int(headers.get('X-RateLimit-Limit') or 0),
+                 'remaining': int(float(remaining)), 'reset_at': reset_at}
+    except ValueError:
+        return
+    with _lock:
+        _routes[(netloc, route)] = key
+        b = _buckets.setdefault(key, {'next_at': 0})
+        b.update(state)
+
+def retry_delay(status, headers, body):
+    """Seconds to wait before retrying a rate-limited response, or None if it isn't one."""
+    if status not in (403, 429):
+        return None
+    if headers.get('Retry-After'):
+        try:
+            return float(headers['Retry-After'])
+        except ValueError:
+            pass
+    try:
+        data = json.loads(body or b'null') or {}
+    except ValueError:
+        data = {}
+    if isinstance(data, dict):
+        # Discord: {"retry_after": 1.5}; Telegram: {"parameters": {"retry_after": 3}}
+        delay = data.get('retry_after') or (data.get('parameters') or {}).get('retry_after')
+        if delay:
+            return float(delay)
+    if headers.get('X-RateLimit-Remaining') == '0' and headers.get('X-RateLimit-Reset'):
+        return max(0.0, float(headers['X-RateLimit-Reset']) - time.time())
+    return 1.0 if status == 429 else None
+
+def note_retry(delay):
+    with _lock:
+        stats['retries'] += 1
+        stats['waited'] += delay
+
+def summary():
+    """One line per bucket seen this run: remaining budget and time to reset."""
+    now = time.time()
+    with _lock:
+        return [f"{key}: {b['remaining']}/{b['limit'] or '?'} left, resets in {max(0, int(b['reset_at'] - now))}s"
+                for key, b in sorted(_buckets.items())]
@@ -0,0 +1,181 @@
+"""
+Platform renderers: Status → message text.
+
+Each platform is a Layout: its markup for the header, a feature entry and the
+footer, and the length budget of one message. Rendering fits the status into
+that budget without cutting through markup: every feature gets its title
+line first, prompts are then added back in feature order while they fit
+(dropping a feature's last prompts before its whole block), and features
+whose titles don't fit at all are counted in an "…and N more" line.
+
+Budget lets core stop resolving commits and fetching prompt text as soon as
+no layout has room left for them.
+"""
+
+TELEGRAM_MAX_CHARS = 4096   # counted in UTF-16 units, as both platforms count
+DISCORD_MAX_CHARS  = 2000
+NOW_PLACEHOLDER    = '0000-00-00 00:00 UTC'   # same length as the real timestamp
+
+def html_escape(text):
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+def feature_label(f):
+    return label_of(f.title, f.issue)
+
+def label_of(title, issue):
+    prefix = f"#{issue} — " if issue else ""
+    return prefix + title
+
+def text_length(text):
+    return len(text.encode('utf-16-le')) // 2
+
+def cost(lines):
+    """Length the lines add to a message, newline included."""
+    return sum(text_length(l) + 1 for l in lines)
+
+class Layout:
+    """Shared fitting; subclasses set max_chars and provide header, title_line,
+    prompt_lines, more_line and footer."""
+    max_chars = None
+
+    def fitted_prompts(self, prompts, room):
+        """The prompt lines for as many of `prompts` as fit in `room`."""
+        for n in range(len(prompts or ()), 0, -1):
+            lines = self.prompt_lines(prompts[:n])
+            if cost(lines) <= room:
+                return lines
+        return []
+
+    def shortened_title(self, label, room):
+        """The title line with `label` cut (at a character, never inside markup) to fit `room`."""
+        lo, hi = 0, len(label)
+        best = None
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            line = self.title_line(label[:mid].rstrip() + '…')
+            if cost([line]) <= room:
+                best, lo = line, mid + 1
+            else:
+                hi = mid - 1
+        return best
+
+    def render(self, status, now):
+        head = self.header(status.version)
+        features = status.features
+        if not features:
+            return '\n'.join(head + self.footer(False, now))
+        tail = self.footer(True, now)
+        room = self.max_chars + 1 - cost(head) - cost(tail)   # +1: the last line has no newline
+
+        titles = [self.title_line(feature_label(f)) for f in features]
+        more = []
+        if cost(titles) > room:
+            more_cost = cost([self.more_line(len(features))])
+            kept = 0
+            while cost(titles[:kept + 1]) + more_cost <= room:
+                kept += 1
+            if kept == 0:
+                first = self.shortened_title(feature_label(features[0]), room - more_cost)
+                titles, kept = ([first], 1) if first else ([], 0)
+            titles = titles[:kept]
+            more = [self.more_line(len(features) - kept)]
+        room -= cost(titles) + cost(more)
+
+        body = []
+        for f, title in zip(features, titles):
+            prompts = self.fitted_prompts(f.prompts, room)
+            room -= cost(prompts)
+            body += [title] + prompts
+        return '\n'.join(head + body + more + tail)
+
+class TelegramLayout(Layout):
+    max_chars = TELEGRAM_MAX_CHARS
+
+    def header(self, version):
+        lines = [
+            f"🧪 <b>Testable on Dev</b>",
+            "",
+            f"📦 <b>Version: {html_escape(version)}</b>" if version else "",
+            "<i>Switch to the <b>dev</b> Steam beta branch, then verify your version matches above.</i>",
+            "",
+        ]
+        # Remove blank lines from version block if no version
+        lines = [l for l in lines if l != ""]
+        lines.append("")
+        return lines
+
+    def title_line(self, label):
+        return f"✅ <b>{html_escape(label)}</b>"
+
+    def prompt_lines(self, prompts):
+        return ["<i>Try these:</i>"] + [f'  💬 <i>"{html_escape(p)}"</i>' for p in prompts]
+
+    def more_line(self, count):
+        return f"<i>…and {count} more on dev</i>"
+
+    def footer(self, has_features, now):
+        return ["" if has_features else "<i>Nothing new since last release</i>\n", f"<i>Updated: {now}</i>"]
+
+class DiscordLayout(Layout):
+    max_chars = DISCORD_MAX_CHARS
+
+    def header(self, version):
+        lines = ["🧪 **Testable on Dev**", ""]
+        if version:
+            lines += [f"📦 **Version: {version}**",
+                      "*Switch to the **dev** Steam beta branch, then verify your version matches above.*",
+                      ""]
+        return lines
+
+    def title_line(self, label):
+        return f"✅ **{label}**"
+
+    def prompt_lines(self, prompts):
+        return ["*Try these:*"] + [f'  💬 *"{p}"*' for p in prompts]
+
+    def more_line(self, count):
+        return f"*…and {count} more on dev*"
+
+    def footer(self, has_features, now):
+        return ["" if has_features else "*Nothing new since last release*\n", f"*Updated: {now}*"]
+
+TELEGRAM = TelegramLayout()
+DISCORD  = DiscordLayout()
+
+# ── Budget while resolving ──────────────────────────────────────────────────
+
+class Budget:
+    """Room left in each layout's message while features are being resolved.
+
+    Deliberately optimistic (no "…and N more" line is reserved), so it never
+    stops work the renderer could still have used; the renderer has the
+    final say on what is shown.
+    """
+
+    def __init__(self, layouts, version):
+        self.layouts = list(layouts)
+        self.rooms = [l.max_chars + 1 - cost(l.header(version)) - cost(l.footer(True, NOW_PLACEHOLDER))
+                      for l in self.layouts]
+        self.open = [True] * len(self.layouts)   # False once a title didn't fit
+
+    def take_title(self, title, issue):
+        """Charge a feature's title line; False if no layout can show it."""
+        label = label_of(title, issue)
+        shown = False
+        for i, l in enumerate(self.layouts):
+            line_cost = cost([l.title_line(label)])
+            if self.open[i] and line_cost <= self.rooms[i]:
+                self.rooms[i] -= line_cost
+                shown = True
+            else:
+                self.open[i] = False   # the renderer keeps titles in order, so nothing after this shows
+        return shown
+
+    def prompt_slots(self):
+        """Upper bound on how many more prompt blocks could still be shown anywhere."""
+        return max((room // cost(l.prompt_lines(['x' * 6])) for l, room in zip(self.layouts, self.rooms)),
+                   default=0)
+
+    def take_prompts(self, prompts):
+        for i, l in enumerate(self.layouts):
+            self.rooms[i] -= cost(l.fitted_prompts(prompts, self.rooms[i]))
@@ -0,0 +1,88 @@
+"""
+Commit classification rules, compiled once from dev-status-rules.json.
+
+The rules file lists the skip phrases (case-insensitive substrings), the
+conventional-commit types that count as features, the types stripped from
+display titles and the keywords of a closing reference. They are compiled
+into a handful of regexes so one call to classify() decides noise, display
+title and issue number for a subject, however long the skip list grows:
+
+  - the skip phrases become a single trie-shaped alternation, so each
+    position of the subject is tried against shared prefixes once rather
+    than against every phrase in turn;
+  - the type prefix is matched once and serves both the feature check and
+    the display title;
+  - the closing keywords are one alternation searched ahead of the '#',
+    so finding the issue number stays linear however many bare "#NNN"
+    references a long PR body holds, and subjects without a '#' skip it.
+"""
+
+import os, re, json, hashlib
+from collections import namedtuple
+from functools import lru_cache
+
+RULES_PATH = os.environ.get('DEV_STATUS_RULES') or \
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dev-status-rules.json')
+
+ISSUE_REF   = re.compile(r'#(\d+)')
+PR_SUFFIXES = re.compile(r'(\s*\(#\d+\))+\s*$')
+
+Classification = namedtuple('Classification', 'noise title issue')
+
+def trie_pattern(phrases):
+    """Regex matching any of `phrases`, factored into a trie of shared prefixes."""
+    root = {}
+    for p in phrases:
+        node = root
+        for ch in p:
+            node = node.setdefault(ch, {})
+        node[''] = True
+    def build(node):
+        if '' in node:
+            return ''    # a shorter phrase already matches — longer ones add nothing
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items())]
+        return alts[0] if len(alts) == 1 else '(?:' + '|'.join(alts) + ')'
+    return build(root) if root else r'(?!)'
+
+def alternation(words):
+    # Longest first, so "fixes" wins over "fix"
+    return '|'.join(re.escape(w) for w in sorted(set(words), key=lambda w: (-len(w), w)))
+
+class Rules:
+    def __init__(self, config):
+        self.config = config
+        self.skip = re.compile(trie_pattern(sorted({p.lower() for p in config['skip']})))
+        self.feature_types = {t.lower() for t in config['feature_types']}
+        self.strip_types = {t.lower() for t in config['strip_types']}
+        self.prefix = re.compile(r'(%s)(?:\([^)]+\))?:\s*' % alternation(self.feature_types | self.strip_types),
+                                 re.IGNORECASE)
+        self.closing = re.compile(r'(?:%s)\s+#(\d+)' % alternation(config['issue_keywords']), re.IGNORECASE)
+        self.digest = hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()[:16]
+
+    def issue_number(self, text):
+        """First "closes/fixes #NNN" reference in `text`, else the first bare #NNN."""
+        m = self.closing.search(text or '') or ISSUE_REF.search(text or '')
+        return m.group(1) if m else None
+
+    def classify(self, subject):
+        issue = self.issue_number(subject) if '#' in subject else None
+        m = self.prefix.match(subject)
+        kind = m.group(1).lower() if m else None
+        # Skip anything that isn't a feat: or fix: (docs, chore, ci, refactor, etc.)
+        # unless it has an issue number reference (manually written commit)
+        noise = bool(self.skip.search(subject.lower())) or (kind not in self.feature_types and not issue)
+        title = subject[m.end():] if kind in self.strip_types else subject
+        if issue and title.rstrip().endswith(')'):
+            title = PR_SUFFIXES.sub('', title)
+        return Classification(noise, title.strip(), issue)
+
+def load(path=RULES_PATH):
+    with open(path, encoding='utf-8') as f:
+        return Rules(json.load(f))
+
+RULES = load()
+
+@lru_cache(maxsize=4096)
+def classify(subject):
+    """(noise, display title, issue number) for a commit subject."""
+    return RULES.classify(subject)
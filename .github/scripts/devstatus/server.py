@@ -0,0 +1,202 @@
+"""
+Webhook server mode: keep one process (and its warm state) per deployment.
+
+GitHub push webhooks are verified against DEV_STATUS_WEBHOOK_SECRET
+(X-Hub-Signature-256) and pushes to the watched branch are queued. A single
+worker coalesces bursts: it waits until no push has arrived for `debounce`
+seconds (but never longer than `max_delay` after the first one), fetches the
+local clone and runs one update for the newest head. Everything the one-shot
+script rebuilds per run stays warm in between: the clone, the HTTP
+keep-alive pool, the response cache (in memory as well as on disk), the
+commit index and the sinks' message IDs and hashes.
+
+Received payloads can be saved (`record_dir`) and replayed later with
+replay(), which signs them like GitHub does.
+"""
+
+import os, hmac, json, time, hashlib, threading, traceback, urllib.error, urllib.request
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from . import git, metrics, update
+from .index import CommitIndex
+from .lease import IGNORED_PATHS
+from .targets import Target
+
+WEBHOOK_SECRET = os.environ.get('DEV_STATUS_WEBHOOK_SECRET', '')
+BRANCH         = os.environ.get('DEV_STATUS_BRANCH', 'dev')
+MAX_BODY       = 25 * 1024 * 1024      # GitHub caps webhook payloads at 25 MB
+
+def signature(secret, body):
+    return 'sha256=' + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+def verify(secret, body, header):
+    return bool(header) and hmac.compare_digest(signature(secret, body), header)
+
+def relevant_push(payload, branch=BRANCH):
+    """True if the push moved `branch` and touched more than the ignored paths."""
+    if payload.get('ref') != f'refs/heads/{branch}' or payload.get('deleted'):
+        return False
+    commits = payload.get('commits')
+    if not commits:
+        return True        # forced update or a push GitHub didn't itemise
+    paths = {p for c in commits for key in ('added', 'removed', 'modified') for p in c.get(key) or ()}
+    return not paths or bool(paths - IGNORED_PATHS)
+
+class Coalescer:
+    """Runs `action(head)` once per burst of pushes, for the newest head."""
+
+    def __init__(self, action, debounce, max_delay):
+        self.action = action
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.cond = threading.Condition()
+        self.head = None
+        self.first = self.last = 0.0
+        self.pushes = 0
+
+    def push(self, head):
+        with self.cond:
+            now = time.monotonic()
+            if self.head is None:
+                self.first = now
+            self.head = head
+            self.last = now
+            self.pushes += 1
+            self.cond.notify()
+
+    def next_burst(self):
+        """Block until a burst is over; returns (newest head, pushes in the burst)."""
+        with self.cond:
+            while True:
+                if self.head is None:
+                    self.cond.wait()
+                    continue
+                now = time.monotonic()
+                due = min(self.last + self.debounce, self.first + self.max_delay)
+                if now >= due:
+                    head, pushes = self.head, self.pushes
+                    self.head, self.pushes = None, 0
+                    return head, pushes
+                self.cond.wait(due - now)
+
+    def loop(self):
+        while True:
+            head, pushes = self.next_burst()
+            try:
+                self.action(head, pushes)
+            except Exception:
+                traceback.print_exc()
+
+class StatusServer:
+    def __init__(self, sinks, secret=WEBHOOK_SECRET, branch=BRANCH, debounce=3.0, max_delay=15.0,
+                 record_dir=None):
+        if not secret:
+            raise ValueError("a webhook secret is required (DEV_STATUS_WEBHOOK_SECRET)")
+        self.sinks = sinks
+        self.secret = secret
+        self.branch = branch
+        self.record_dir = record_dir
+        self.index = CommitIndex()
+        self.coalescer = Coalescer(self.update, debounce, max_delay)
+        self.lock = threading.Lock()   # one update at a time
+        self.last = {}                 # summary of the last update, for /healthz
+
+    def update(self, head, pushes=1):
+        with self.lock:
+            started = time.monotonic()
+            print(f"── Update for {head[:12]} ({pushes} push{'es' if pushes > 1 else ''}) ──")
+            update.reset_counters()
+            if not git.fetch():
+                print("  continuing with the last fetched state")
+            try:
+                update.run(Target(branch=self.branch, head=head, sinks=self.sinks), self.index)
+            finally:
+                update.record_counters()
+                metrics.write()
+            self.last = {'head': head, 'pushes': pushes, 'seconds': round(time.monotonic() - started, 3),
+                         'finished_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())}
+            print(f"Update done in {self.last['seconds']}s")
+
+    def handle(self, event, delivery, body, sig):
+        """(HTTP status, response body) for one webhook delivery."""
+        if not verify(self.secret, body, sig):
+            return 401, {'error': 'bad signature'}
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return 400, {'error': 'invalid JSON'}
+        if self.record_dir:
+            self.record(event, delivery, payload)
+        if event == 'ping':
+            return 200, {'ok': True, 'zen': payload.get('zen')}
+        if event != 'push':
+            return 202, {'ignored': f'event {event}'}
+        if not relevant_push(payload, self.branch):
+            return 202, {'ignored': 'not a relevant push'}
+        self.coalescer.push(payload['after'])
+        return 202, {'queued': payload['after']}
+
+    def record(self, event, delivery, payload):
+        os.makedirs(self.record_dir, exist_ok=True)
+        name = f"{int(time.time() * 1000)}-{event}-{delivery or 'local'}.json"
+        with open(os.path.join(self.record_dir, name), 'w') as f:
+            json.dump({'event': event, 'payload': payload}, f, indent=2)
+
+    def serve(self, host, port):
+        threading.Thread(target=self.coalescer.loop, daemon=True).start()
+        httpd = ThreadingHTTPServer((host, port), make_handler(self))
+        print(f"Listening on http://{host}:{httpd.server_port} for pushes to {self.branch}")
+        try:
+            httpd.serve_forever()
+        finally:
+            httpd.server_close()
+
+def make_handler(server):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, fmt, *args):
+            print(f"  {self.address_string()} {fmt % args}")
+
+        def reply(self, status, obj):
+            body = json.dumps(obj).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == '/healthz':
+                return self.reply(200, {'ok': True, 'branch': server.branch, 'last_update': server.last})
+            self.reply(404, {'error': 'not found'})
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            if length > MAX_BODY:
+                return self.reply(413, {'error': 'payload too large'})
+            body = self.rfile.read(length)
+            self.reply(*server.handle(self.headers.get('X-GitHub-Event', ''),
+                                      self.headers.get('X-GitHub-Delivery', ''),
+                                      body, self.headers.get('X-Hub-Signature-256', '')))
+    return Handler
+
+# ── Replaying recorded deliveries ───────────────────────────────────────────
+
+def replay(url, path, secret=WEBHOOK_SECRET, event=None):
+    """POST a saved payload to a running server, signed as GitHub would; returns (status, reply)."""
+    with open(path) as f:
+        saved = json.load(f)
+    # Files written by record() wrap the payload; raw payloads (e.g. copied from GitHub) don't
+    if 'payload' in saved and 'event' in saved:
+        event, saved = event or saved['event'], saved['payload']
+    body = json.dumps(saved).encode()
+    req = urllib.request.Request(url, data=body, method='POST', headers={
+        'Content-Type': 'application/json',
+        'X-GitHub-Event': event or 'push',
+        'X-GitHub-Delivery': f'replay-{int(time.time())}',
+        'X-Hub-Signature-256': signature(secret, body),
+    })
+    try:
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            return resp.status, resp.read().decode()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode()
@@ -0,0 +1,243 @@
+"""
+Chat platforms the status is posted to.
+
+Each sink renders the shared Status in its own markup, edits the message it
+posted last time (ID kept in a GitHub Actions variable) and falls back to
+posting a new one. A sink is enabled when its bot token is in the environment.
+
+Next to the message ID each sink keeps a "<content>:<inputs>" hash variable.
+The content hash covers the rendered message minus its Updated: timestamp, so
+with DEV_STATUS_SKIP_UNCHANGED=content an identical feature list costs no
+edit and no variable write. With =inputs the run also stops before any
+GitHub lookups when the feature commits and version match the last post (at
+the price of not picking up issue edits until the next feature commit).
+"""
+
+import os, hashlib
+
+from . import metrics, render, transport
+from .transport import HTTPError
+from .github import REPO, gh_set_variable
+from .targets import variable_suffix
+
+TELEGRAM_CHAT_ID = "-1003732082318"
+TELEGRAM_API_URL = os.environ.get('TELEGRAM_API_URL', 'https://api.telegram.org')
+DISCORD_API_URL  = os.environ.get('DISCORD_API_URL', 'https://discord.com/api/v10')
+SKIP_UNCHANGED   = os.environ.get('DEV_STATUS_SKIP_UNCHANGED', 'off')  # off | content | inputs
+
+def parse_hashes(value):
+    content, _, inputs = (value or '').partition(':')
+    return content, inputs
+
+class TelegramSink:
+    name = 'telegram'
+    message_var = 'TELEGRAM_STATUS_MESSAGE_ID'
+    hash_var = 'TELEGRAM_STATUS_HASH'
+    repo = REPO                     # where message_var / hash_var live
+    layout = render.TELEGRAM
+
+    def __init__(self, token, chat_id, thread_id, message_id, hashes=''):
+        self.token = token
+        self.chat_id = chat_id
+        self.thread_id = thread_id
+        self.message_id = message_id
+        self.hashes = hashes
+
+    @classmethod
+    def from_env(cls):
+        if not os.environ.get('TELEGRAM_BOT_TOKEN'):
+            return None
+        return cls(os.environ['TELEGRAM_BOT_TOKEN'], TELEGRAM_CHAT_ID,
+                   os.environ['TELEGRAM_DEV_THREAD_ID'],
+                   os.environ.get('TELEGRAM_STATUS_MESSAGE_ID', ''),
+                   os.environ.get('TELEGRAM_STATUS_HASH', ''))
+
+    @classmethod
+    def from_config(cls, cfg):
+        if not os.environ.get('TELEGRAM_BOT_TOKEN'):
+            return None
+        return cls(os.environ['TELEGRAM_BOT_TOKEN'], str(cfg.get('chat_id', TELEGRAM_CHAT_ID)),
+                   str(cfg['thread_id']), '')
+
+    def describe(self):
+        return f"thread {self.thread_id}"
+
+    def render(self, status, now):
+        return self.layout.render(status, now)
+
+    def tg(self, method, data):
+        url = f"{TELEGRAM_API_URL}/bot{self.token}/{method}"
+        try:
+            return transport.request('POST', url, body=data).json()
+        except (HTTPError, ValueError) as e:
+            print(f"  tg {method} failed: {e}")
+            return {'ok': False}
+
+    def edit(self, message):
+        result = self.tg('editMessageText', {
+            'chat_id': self.chat_id,
+            'message_id': int(self.message_id),
+            'text': message,
+            'parse_mode': 'HTML'
+        })
+        return result.get('ok')
+
+    def send(self, message):
+        result = self.tg('sendMessage', {
+            'chat_id': self.chat_id,
+            'message_thread_id': int(self.thread_id),
+            'text': message,
+            'parse_mode': 'HTML'
+        })
+        if result.get('ok'):
+            return str(result['result']['message_id'])
+        return None
+
+class DiscordSink:
+    name = 'discord'
+    message_var = 'DISCORD_STATUS_MESSAGE_ID'
+    hash_var = 'DISCORD_STATUS_HASH'
+    repo = REPO
+    layout = render.DISCORD
+
+    def __init__(self, token, channel_id, message_id, hashes=''):
+        self.token = token
+        self.channel_id = channel_id
+        self.message_id = message_id
+        self.hashes = hashes
+
+    @classmethod
+    def from_env(cls):
+        if not os.environ.get('DISCORD_BOT_TOKEN'):
+            return None
+        return cls(os.environ['DISCORD_BOT_TOKEN'],
+                   os.environ['DISCORD_STATUS_CHANNEL_ID'],
+                   os.environ.get('DISCORD_STATUS_MESSAGE_ID', ''),
+                   os.environ.get('DISCORD_STATUS_HASH', ''))
+
+    @classmethod
+    def from_config(cls, cfg):
+        if not os.environ.get('DISCORD_BOT_TOKEN'):
+            return None
+        return cls(os.environ['DISCORD_BOT_TOKEN'], str(cfg['channel_id']), '')
+
+    def describe(self):
+        return f"channel {self.channel_id}"
+
+    def render(self, status, now):
+        return self.layout.render(status, now)
+
+    def discord_request(self, method, path, data=None):
+        url = f"{DISCORD_API_URL}{path}"
+        try:
+            return transport.request(method, url, body=data,
+                                     headers={'Authorization': f'Bot {self.token}'}).json()
+        except HTTPError as e:
+            print(f"  Discord {method} {path} failed: {e} {e.text()}")
+            return None
+        except ValueError as e:
+            print(f"  Discord {method} {path} failed: {e}")
+            return None
+
+    def edit(self, message):
+        result = self.discord_request('PATCH', f'/channels/{self.channel_id}/messages/{self.message_id}',
+                                      {'content': message})
+        return bool(result and result.get('id'))
+
+    def send(self, message):
+        result = self.discord_request('POST', f'/channels/{self.channel_id}/messages',
+                                      {'content': message})
+        if result and result.get('id'):
+            return str(result['id'])
+        return None
+
+SINK_TYPES = [TelegramSink, DiscordSink]
+
+def configured_sinks():
+    return [s for s in (t.from_env() for t in SINK_TYPES) if s]
+
+def sinks_from_config(target_cfg, name, repo, variables):
+    """Sinks for one batch target (see batch.py).
+
+    Message IDs and hashes come from `variables` ({repo: {name: value}, or None
+    if that repo's variables couldn't be listed}), named <default>_<NAME>
+    unless the config names them.
+    """
+    suffix = variable_suffix(name)
+    sinks = []
+    for t in SINK_TYPES:
+        cfg = target_cfg.get(t.name)
+        sink = cfg and t.from_config(cfg)
+        if not sink:
+            continue
+        sink.repo = cfg.get('variables_repo', repo)
+        sink.message_var = cfg.get('message_var', f"{t.message_var}_{suffix}")
+        sink.hash_var = cfg.get('hash_var', f"{t.hash_var}_{suffix}")
+        known = variables.get(sink.repo)
+        if known is None:
+            # Posting without knowing the old message would leave a duplicate behind
+            print(f"  {name}/{t.name}: variables of {sink.repo} unavailable — skipping this sink")
+            continue
+        sink.message_id = known.get(sink.message_var, '')
+        sink.hashes = known.get(sink.hash_var, '')
+        sinks.append(sink)
+    return sinks
+
+def refresh_ids(sinks, variables, repo):
+    """Take message IDs and hashes from a fresh listing of `repo`'s variables.
+
+    The workflow's environment is captured when the job starts; another run
+    may have posted (and stored a new ID) since.
+    """
+    for s in sinks:
+        if s.repo == repo:
+            s.message_id = variables.get(s.message_var, s.message_id)
+            s.hashes = variables.get(s.hash_var, s.hashes)
+
+def inputs_unchanged(sinks, inputs):
+    """True if every sink already shows a message built from these inputs."""
+    return SKIP_UNCHANGED == 'inputs' and all(
+        s.message_id and parse_hashes(s.hashes)[1] == inputs for s in sinks)
+
+def publish(sink, status, now, inputs):
+    """Edit the sink's existing message, or post a new one and remember its ID.
+
+    Returns the sink's log lines so parallel sinks don't interleave output.
+    """
+    with metrics.phase('render'):
+        message = sink.render(status, now)
+        content = hashlib.sha256(sink.render(status, '').encode()).hexdigest()[:16]
+    hashes = f"{content}:{inputs}"
+    log = [f"── {sink.name} message ──", message, ""]
+
+    if SKIP_UNCHANGED != 'off' and sink.message_id and parse_hashes(sink.hashes)[0] == content:
+        log.append(f"[{sink.name}] Content unchanged — skipping edit of {sink.message_id}")
+        if hashes != sink.hashes and gh_set_variable(sink.hash_var, hashes, sink.repo):
+            sink.hashes = hashes
+        return log
+
+    new_msg_id = None
+    if sink.message_id:
+        with metrics.phase('post'):
+            edited = sink.edit(message)
+        if edited:
+            log.append(f"[{sink.name}] Edited existing message {sink.message_id}")
+            new_msg_id = sink.message_id
+        else:
+            log.append(f"[{sink.name}] Edit failed — posting new message")
+
+    if not new_msg_id:
+        with metrics.phase('post'):
+            new_msg_id = sink.send(message)
+        if not new_msg_id:
+            log.append(f"[{sink.name}] Failed to post message")
+            return log
+        log.append(f"[{sink.name}] Posted new message {new_msg_id}")
+
+    if new_msg_id != sink.message_id:
+        if gh_set_variable(sink.message_var, new_msg_id, sink.repo):
+            log.append(f"[{sink.name}] Updated {sink.message_var} → {new_msg_id}")
+        sink.message_id = new_msg_id   # a long-lived process edits it next time either way
+    if SKIP_UNCHANGED != 'off' and hashes != sink.hashes and gh_set_variable(sink.hash_var, hashes, sink.repo):
+        sink.hashes = hashes
+    return log
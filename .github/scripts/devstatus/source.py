@@ -0,0 +1,79 @@
+"""
+Where the unreleased commit list and version come from.
+
+'git' walks origin/main..HEAD locally and needs full history. 'compare' asks
+the paginated compare API for main...HEAD instead, so the workflow can run on
+a depth-1 checkout; About/About.xml is read from that checkout, or from the
+contents API if it isn't there. 'auto' (default) picks 'compare' when the
+clone is shallow. If the compare API fails, a full clone falls back to git;
+a shallow one (or one without origin/<base>) can't list the commits, so the
+update stops with SourceUnavailable rather than post an empty list.
+
+Both take a targets.Target (default: HEAD of the working directory against
+main of this repository).
+"""
+
+import os
+
+from . import git, github, metrics
+from .targets import DEFAULT
+
+COMMIT_SOURCE = os.environ.get('DEV_STATUS_COMMIT_SOURCE', 'auto')  # auto | git | compare
+
+stats = {'read': 0}   # commits actually pulled from the stream this run
+
+class SourceUnavailable(Exception):
+    """The commit list couldn't be read in full; a status built from it would drop features."""
+
+def use_compare(target=DEFAULT):
+    if COMMIT_SOURCE == 'auto':
+        return git.is_shallow(target.path)
+    return COMMIT_SOURCE == 'compare'
+
+def iter_unreleased_commits(target=DEFAULT):
+    """Unreleased commits newest first, produced lazily from whichever source applies."""
+    commits = _iter_source(target)
+    while True:
+        # Only the time spent producing commits counts as 'git', not the consumer's
+        with metrics.phase('git'):
+            c = next(commits, None)
+        if c is None:
+            return
+        stats['read'] += 1
+        yield c
+
+def remote_head(target):
+    """The head to ask GitHub about: the local sha if the clone has it, else the branch name."""
+    return git.head_sha(target.head, target.path) or target.branch
+
+def _iter_source(target):
+    if use_compare(target):
+        commits = github.iter_compare_commits(target.base, remote_head(target), target.repo)
+        if commits is not None:
+            try:
+                for c in commits:
+                    subject, body = git.split_message(c['commit']['message'])
+                    yield {'sha': c['sha'], 'subject': subject, 'body': body}
+            except github.HTTPError as e:
+                raise SourceUnavailable(f"compare API: {e}") from e
+            return
+        if git.is_shallow(target.path):
+            raise SourceUnavailable("compare API failed and the clone is shallow")
+        print("  compare API failed — falling back to local git")
+    if not git.head_sha(f'origin/{target.base}', target.path):
+        raise SourceUnavailable(f"origin/{target.base} is not in the local clone")
+    yield from git.iter_unreleased_commits(target.head, target.base, target.path)
+
+def get_version(recent, target=DEFAULT):
+    """Version on the target's head; `recent` are the newest commits, used as a last-resort hint."""
+    with metrics.phase('git'):
+        return _get_version(recent, target)
+
+def _get_version(recent, target):
+    if not use_compare(target):
+        return git.get_version(target.head, target.path)
+    version = git.parse_version(git.show_file(target.head, 'About/About.xml', target.path))
+    if not version:
+        version = git.parse_version(github.get_file_text('About/About.xml', remote_head(target), target.repo))
+    # Fallback: scan recent commit messages (a shallow clone only has HEAD)
+    return version or git.version_from_subjects(c['subject'] for c in recent[:5])
@@ -0,0 +1,22 @@
+"""What one status message tracks: a branch of a repository, posted to some sinks."""
+
+import re
+from dataclasses import dataclass, field
+
+from . import git, github
+
+@dataclass
+class Target:
+    name: str = 'dev'
+    repo: str = github.REPO        # owner/name on GitHub
+    branch: str = 'dev'            # branch name on GitHub (compare API, fallback for head)
+    head: str = 'HEAD'             # the same branch as a rev in the local clone
+    base: str = git.DEFAULT_BRANCH
+    path: str = None               # local clone of `repo`; None is the working directory
+    sinks: list = field(default_factory=list)
+
+DEFAULT = Target()
+
+def variable_suffix(name):
+    """'fork-dev' → 'FORK_DEV', for per-target variable names."""
+    return re.sub(r'\W', '_', name).upper()
@@ -0,0 +1,216 @@
+"""
+Shared HTTP transport for every API helper.
+
+Keeps persistent keep-alive connections per host (so each GitHub, Telegram
+and Discord call after the first skips the TCP/TLS handshake), asks for gzip
+and decodes it, and reports every failure the same way: an HTTPError whose
+status is the HTTP code, or None when the request never got a response.
+Lookups made while a deadline.window() is open are bounded, retried and
+hedged against it (see deadline.py).
+"""
+
+import gzip, json, zlib, time, atexit, queue, threading, http.client, urllib.parse
+
+from . import deadline, metrics, ratelimit
+
+TIMEOUT = 10
+USER_AGENT = 'RimMind-dev-status'
+TRANSIENT = {500, 502, 503, 504}    # worth retrying an idempotent request after
+
+class HTTPError(Exception):
+    def __init__(self, status, reason, body=b'', headers=None):
+        super().__init__(f"HTTP {status} {reason}" if status else reason)
+        self.status = status
+        self.reason = reason
+        self.body = body
+        self.headers = headers or {}
+
+    def text(self):
+        return self.body.decode('utf-8', 'replace')
+
+class DeadlineExceeded(HTTPError):
+    """A lookup not sent because the run's deadline has (nearly) passed."""
+
+    def __init__(self):
+        super().__init__(None, 'deadline exceeded')
+
+class Response:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers   # http.client.HTTPMessage, case-insensitive .get()
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body) if self.body else None
+
+# ── Connection pool ─────────────────────────────────────────────────────────
+
+_idle = {}                     # (scheme, host:port) → idle connections
+_lock = threading.Lock()
+
+def _acquire(scheme, netloc, timeout):
+    with _lock:
+        conns = _idle.get((scheme, netloc))
+        if conns:
+            conn = conns.pop()
+            conn.timeout = timeout
+            if conn.sock:
+                conn.sock.settimeout(timeout)
+            return conn, True
+    cls = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+    return cls(netloc, timeout=timeout), False
+
+def _release(scheme, netloc, conn):
+    with _lock:
+        _idle.setdefault((scheme, netloc), []).append(conn)
+
+@atexit.register
+def close_all():
+    with _lock:
+        for conns in _idle.values():
+            for conn in conns:
+                conn.close()
+        _idle.clear()
+
+# ── Requests ────────────────────────────────────────────────────────────────
+
+# A keep-alive connection the server has already closed fails on first use
+# with one of these; the request is then retried once on a fresh connection.
+_STALE = (http.client.RemoteDisconnected, http.client.CannotSendRequest,
+          ConnectionResetError, BrokenPipeError)
+
+def _send(method, parts, body, headers, timeout):
+    path = parts.path + (f'?{parts.query}' if parts.query else '')
+    while True:
+        conn, reused = _acquire(parts.scheme, parts.netloc, timeout)
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            resp = conn.getresponse()
+            data = resp.read()
+        except _STALE as e:
+            conn.close()
+            if reused:
+                continue
+            raise HTTPError(None, f"{type(e).__name__}: {e}")
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            raise HTTPError(None, f"{type(e).__name__}: {e}")
+        if resp.will_close:
+            conn.close()
+        else:
+            _release(parts.scheme, parts.netloc, conn)
+        wire = len(data)
+        if resp.getheader('Content-Encoding', '').lower() == 'gzip':
+            try:
+                data = gzip.decompress(data)
+            except (OSError, EOFError, zlib.error) as e:     # truncated or corrupt body: retried like a dropped one
+                raise HTTPError(None, f"gzip body: {type(e).__name__}: {e}")
+        return resp, data, wire
+
+def _attempt(method, url, parts, body, headers, timeout, conditional):
+    """Send once and record it; returns (response, body)."""
+    host, endpoint = ratelimit.route_of(method, url)
+    start = time.perf_counter()
+    try:
+        resp, data, wire = _send(method, parts, body, headers, timeout)
+    except HTTPError:
+        metrics.record_request(host, endpoint, None, time.perf_counter() - start, len(body or b''), 0)
+        raise
+    elapsed = time.perf_counter() - start
+    outcome = None
+    if method == 'GET':
+        outcome = 'hit' if resp.status == 304 else 'changed' if conditional else 'miss'
+    metrics.record_request(host, endpoint, resp.status, elapsed, len(body or b''), wire, outcome)
+    deadline.observe((host, endpoint), elapsed)
+    ratelimit.after(method, url, resp.headers)
+    return resp, data
+
+def _hedged(send, method, url, timeout):
+    """Run send(timeout); if it straggles past its endpoint's usual latency, race a second copy.
+
+    Both copies run in daemon threads: the loser finishes in the background
+    (returning its connection to the pool) without holding up exit.
+    """
+    results = queue.Queue()
+
+    def run(copy):
+        try:
+            results.put((copy, send(min(timeout, deadline.remaining())), None))
+        except HTTPError as e:
+            results.put((copy, None, e))
+
+    threading.Thread(target=run, args=(1,), daemon=True).start()
+    delay = min(deadline.hedge_delay(ratelimit.route_of(method, url)), deadline.remaining())
+    try:
+        copy, result, error = results.get(timeout=max(0, delay))
+    except queue.Empty:
+        if deadline.expired() or not ratelimit.has_room(method, url) or not deadline.may_hedge():
+            copy, result, error = results.get()
+        else:
+            ratelimit.before(method, url)
+            threading.Thread(target=run, args=(2,), daemon=True).start()
+            copy, result, error = results.get()
+            if error:      # the other copy may still succeed
+                copy, result, error = results.get()
+            if copy == 2 and not error:
+                deadline.note('hedge_wins')
+    if error:
+        raise error
+    return result
+
+def request(method, url, body=None, headers=None, timeout=TIMEOUT, idempotent=None):
+    """Send one request; returns a Response for 2xx/304, raises HTTPError otherwise.
+
+    Paced by the rate-limit scheduler; 429s are retried after the delay the
+    server asks for. Idempotent requests (GETs by default; GraphQL queries
+    say so) are also retried after a transient failure, with jittered
+    backoff. Inside a deadline window they get at most the time left and
+    are hedged, and once it is spent they raise DeadlineExceeded unsent.
+    """
+    parts = urllib.parse.urlsplit(url)
+    hdrs = {'User-Agent': USER_AGENT, 'Accept-Encoding': 'gzip', **(headers or {})}
+    if isinstance(body, (dict, list)):
+        body = json.dumps(body).encode()
+        hdrs.setdefault('Content-Type', 'application/json')
+
+    idempotent = method == 'GET' if idempotent is None else idempotent
+    budgeted = idempotent and deadline.active()
+    conditional = 'If-None-Match' in hdrs or 'If-Modified-Since' in hdrs
+
+    def send(limit):
+        return _attempt(method, url, parts, body, hdrs, limit, conditional)
+
+    for attempt in range(ratelimit.RETRIES + 1):
+        limit = timeout
+        if budgeted:
+            if deadline.expired():
+                deadline.note('skipped')
+                raise DeadlineExceeded()
+            limit = min(timeout, deadline.remaining())
+            deadline.note('lookups')
+        ratelimit.before(method, url)
+        try:
+            resp, data = _hedged(send, method, url, limit) if budgeted else send(limit)
+        except HTTPError:
+            delay = deadline.backoff(attempt)
+            if not idempotent or attempt == ratelimit.RETRIES or delay > deadline.remaining() - deadline.MIN_TIMEOUT:
+                raise
+            deadline.note('retries')
+            time.sleep(delay)
+            continue
+        if 200 <= resp.status < 300 or resp.status == 304:
+            return Response(resp.status, resp.headers, data)
+        delay = ratelimit.retry_delay(resp.status, resp.headers, data)
+        transient = delay is None and idempotent and resp.status in TRANSIENT
+        if transient:
+            delay = deadline.backoff(attempt)
+        if delay is None or delay > ratelimit.MAX_WAIT or attempt == ratelimit.RETRIES:
+            break
+        if delay > deadline.remaining() - deadline.MIN_TIMEOUT:
+            break
+        if transient:
+            deadline.note('retries')
+        else:
+            ratelimit.note_retry(delay)
+        time.sleep(delay)
+    raise HTTPError(resp.status, resp.reason, data, resp.headers)
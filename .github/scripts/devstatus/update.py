@@ -0,0 +1,105 @@
+"""One status update: read the unreleased commits, resolve features, publish."""
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from datetime import datetime, timezone
+
+from . import cache, core, deadline, index, metrics, ratelimit, render, source
+from .sinks import inputs_unchanged, publish, refresh_ids
+
+def run(target, commit_index=None, lease=None):
+    """Bring every sink of `target` up to date with its head.
+
+    `commit_index` is a CommitIndex to reuse across updates (server mode);
+    by default it is loaded from the cache directory. With a lease.Lease the
+    run stops as soon as a newer run for the same messages shows up.
+    """
+    if lease and (reason := lease.claim()):
+        print(f"Superseded: {reason} — exiting.")
+        return
+    try:
+        resolved = resolve(target, commit_index)
+    except source.SourceUnavailable as e:
+        print(f"Unreleased commits unavailable ({e}) — keeping the existing message.")
+        return
+    if resolved is None:
+        print("Feature commits and version unchanged since last post — nothing to do.")
+        return
+    print(f"Unreleased commits read: {source.stats['read']}")
+    if resolved[0].partial:
+        print(f"{sum(f.partial for f in resolved[0].features)} features shown without all their details "
+              f"(lookups failed or ran out of time); the next run completes them")
+
+    cache.prune()
+    print_stats()
+    if lease and not ready_to_post(lease, target.sinks, print):
+        return
+    print('\n'.join(publish_all(target.sinks, *resolved)))
+    print_rate_limits()
+
+def ready_to_post(lease, sinks, log):
+    """Last check before posting; also picks up message IDs a concurrent run stored meanwhile."""
+    if (reason := lease.superseded()):
+        log(f"Superseded: {reason} — not posting.")
+        return False
+    if lease.variables is not None:
+        refresh_ids(sinks, lease.variables, lease.repo)
+    return True
+
+def resolve(target, commit_index=None, resolver=None):
+    """(status, inputs) for `target`, or None if its sinks already show these inputs.
+
+    `resolver` is shared between targets in batch mode (see core.collect_status).
+    Lookups get DEV_STATUS_DEADLINE seconds in all (see deadline.py).
+    """
+    with deadline.window(), closing(source.iter_unreleased_commits(target)) as stream:
+        recent, commits = core.peek_commits(stream, core.FINGERPRINT_WINDOW)
+        version = source.get_version(recent, target)
+        inputs = core.input_fingerprint(version, recent)
+        if inputs_unchanged(target.sinks, inputs):
+            return None
+
+        with metrics.phase('resolve'):
+            budget = render.Budget([s.layout for s in target.sinks], version)
+            status = core.collect_status(commits, version, budget, commit_index, resolver)
+    if status.partial:
+        inputs += '+partial'    # never matches a fingerprint, so the next run resolves it again
+    return status, inputs
+
+def publish_all(sinks, status, inputs):
+    """Publish to every sink in parallel; returns their log lines, sink by sink."""
+    now = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')
+    with ThreadPoolExecutor(max_workers=len(sinks)) as pool:
+        return [line for log in pool.map(lambda s: publish(s, status, now, inputs), sinks) for line in log]
+
+def print_stats():
+    print(f"Cache: {cache.stats['hit']} hits, {cache.stats['miss']} misses")
+    print(f"API lookups avoided: {core.stats['avoided']}")
+    print(f"Commit index: {index.stats['reused']} reused, {index.stats['resolved']} resolved, "
+          f"{index.stats['invalidated']} invalidated")
+
+def print_rate_limits():
+    for line in ratelimit.summary():
+        print(f"Rate limit {line}")
+    if ratelimit.stats['waits'] or ratelimit.stats['retries']:
+        print(f"Rate limit pacing: {ratelimit.stats['waits']} waits, {ratelimit.stats['retries']} retries, "
+              f"{ratelimit.stats['waited']:.1f}s total")
+    if (line := deadline.summary()):
+        print(f"Lookup retries: {line}")
+
+def record_counters():
+    metrics.counters.update({
+        'commits_read': source.stats['read'],
+        'cache': dict(cache.stats),
+        'lookups_avoided': core.stats['avoided'],
+        'commit_index': dict(index.stats),
+        'rate_limit': dict(ratelimit.stats, waited=round(ratelimit.stats['waited'], 3)),
+        'deadline': dict(deadline.stats),
+    })
+
+def reset_counters():
+    """Zero the per-run counters, so a long-lived process reports each update on its own."""
+    for counters in (source.stats, cache.stats, core.stats, index.stats, ratelimit.stats, deadline.stats):
+        for key, value in counters.items():
+            counters[key] = type(value)()
+    metrics.reset()